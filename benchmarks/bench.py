@@ -0,0 +1,226 @@
+"""
+Офлайн-бенчмарки гарячих шляхів: завантаження курсів, клієнт API,
+валідація, прогноз і headless-рендер графіка.
+
+Запуск з кореня репозиторію:
+
+    python -m benchmarks.bench                  # виміряти і порівняти з baseline.json
+    python -m benchmarks.bench --save-baseline  # зберегти поточні результати як базові
+
+Мережа не використовується: відповіді NBU генеруються детерміновано.
+Код повернення 1, якщо хоча б один вимір погіршився понад допуск.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from core.graphic import NBUExchangeRates
+from core.ratelimit import RateLimitedSession, TokenBucket
+from core.regression import RatePredictor
+from core.render import render_png
+from core.scrap import ExchangeRateAPIClient
+from core.storage import RateStore
+from core.workers import validate_rates
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "latest.json")
+
+CURRENCIES = ["USD", "EUR", "PLN", "GBP", "CHF", "JPY", "CZK", "CAD", "CNY", "SEK"] + [f"X{i:02d}" for i in range(50)]
+
+# Допуски регресії: у скільки разів вимір може перевищити базовий
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.3
+# Абсолютний поріг: виміри в кілька мілісекунд надто шумні для порівняння лише у разах
+TIME_FLOOR_MS = 2.0
+
+
+class CannedResponse:
+    def __init__(self, data) -> None:
+        self._data = data
+        self.status_code = 200
+        self.headers: Dict[str, str] = {}
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class CannedNBU:
+    """
+    Замінник requests.Session: відповідає як API NBU і рахує запити.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    @staticmethod
+    def rate(code: str, day: date) -> float:
+        base = 10 + sum(map(ord, code)) % 40
+        return round(base * (1 + 0.05 * ((day.toordinal() * 7919 + len(code)) % 1000) / 1000), 4)
+
+    def get(self, url: str, timeout=None) -> CannedResponse:
+        self.requests += 1
+        code = re.search(r"valcode=(\w+)", url)
+        day = re.search(r"date=(\d{8})", url)
+        day = datetime.strptime(day.group(1), "%Y%m%d").date() if day else date.today()
+        codes = [code.group(1)] if code else CURRENCIES
+        return CannedResponse([
+            {"r030": 0, "txt": cc, "rate": self.rate(cc, day), "cc": cc, "exchangedate": day.strftime("%d.%m.%Y")}
+            for cc in codes
+        ])
+
+
+def make_session(http: CannedNBU) -> RateLimitedSession:
+    # Без обмеження частоти: вимірюється код, а не ліміт
+    return RateLimitedSession(bucket=TokenBucket(rate=1e9, capacity=1e9, max_rate=1e9), http=http)
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """
+    Мінімум часу за `repeat` запусків (найменш чутливий до фонового шуму),
+    пікова пам'ять (tracemalloc) окремого запуску.
+    """
+    func()  # прогрів: імпорти, кеші matplotlib
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_ms": round(min(timings) * 1000, 3), "peak_kb": round(peak / 1024, 1)}
+
+
+def run_benchmarks(repeat: int) -> Dict[str, dict]:
+    tmp_dir = tempfile.mkdtemp(prefix="kostik-bench-")
+    try:
+        return _run_benchmarks(repeat, tmp_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _run_benchmarks(repeat: int, tmp_dir: str) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+
+    def record(name: str, func: Callable[[], object], http: CannedNBU = None, repeat_override: int = None) -> None:
+        runs = repeat_override or repeat
+        before = http.requests if http else 0
+        stats = measure(func, runs)
+        if http:
+            # Запити одного запуску: усього за прогрів + runs + вимір пам'яті
+            stats["requests"] = (http.requests - before) // (runs + 2)
+        results[name] = stats
+        print(f"{name:<32} {stats['wall_ms']:>10.2f} ms {stats['peak_kb']:>10.1f} KB  requests={stats.get('requests', '-')}")
+
+    counter = [0]
+
+    def fresh_store() -> RateStore:
+        counter[0] += 1
+        return RateStore(os.path.join(tmp_dir, f"cold-{counter[0]}.sqlite3"))
+
+    # get_rates: холодне сховище (усі дні з «мережі») і тепле (усе локально)
+    for days in (30, 90, 365):
+        http = CannedNBU()
+        session = make_session(http)
+        record(f"get_rates_cold_{days}", lambda: NBUExchangeRates("USD", session, fresh_store()).get_rates(days), http)
+
+        http = CannedNBU()
+        warm = NBUExchangeRates("USD", make_session(http), RateStore(os.path.join(tmp_dir, f"warm-{days}.sqlite3")))
+        warm.get_rates(days)
+        record(f"get_rates_warm_{days}", lambda: warm.get_rates(days), http)
+
+    http = CannedNBU()
+    client = ExchangeRateAPIClient(make_session(http))
+    record("api_get_symbols", client.get_symbols, http)
+    record("api_get_rate_to_uah", lambda: client.get_rate_to_uah("USD"), http)
+    record("api_get_current_rates", lambda: client.get_current_rates(["USD", "EUR", "PLN"]), http)
+
+    dates = [date(2024, 1, 1) + timedelta(days=i) for i in range(366)]
+    rates = [CannedNBU.rate("USD", d) for d in dates]
+
+    record("validate_rates_365", lambda: validate_rates(dates, rates))
+    record("predict_rate_365", lambda: RatePredictor.predict_rate(dates, rates))
+    record("predict_interval_365_1000", lambda: RatePredictor.predict_interval(dates, rates, horizon=7, seed=0))
+
+    chart_settings = {"chart_type": "Лінійний", "show_grid": True, "show_sma": True, "line_color": "#2d78d8"}
+    job = {"currency": "USD", "dates": dates, "rates": rates, "chart_settings": chart_settings}
+    record("render_chart_365", lambda: render_png(job), repeat_override=max(3, repeat // 3))
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict]) -> List[str]:
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if stats["wall_ms"] > max(base["wall_ms"] * TIME_TOLERANCE, base["wall_ms"] + TIME_FLOOR_MS):
+            regressions.append(f"{name}: час {stats['wall_ms']} ms > {base['wall_ms']} ms × {TIME_TOLERANCE}")
+        if stats["peak_kb"] > base["peak_kb"] * MEMORY_TOLERANCE:
+            regressions.append(f"{name}: пам'ять {stats['peak_kb']} KB > {base['peak_kb']} KB × {MEMORY_TOLERANCE}")
+        if stats.get("requests", 0) > base.get("requests", 0):
+            regressions.append(f"{name}: запитів {stats['requests']} > {base['requests']}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Офлайн-бенчмарки Kostik")
+    parser.add_argument("--repeat", type=int, default=15, help="кількість вимірів на бенчмарк")
+    parser.add_argument("--save-baseline", action="store_true", help="зберегти результати як baseline.json")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run_benchmarks(args.repeat)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results
+    }
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"Базові результати збережено: {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("baseline.json не знайдено; запустіть з --save-baseline")
+        return 0
+
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline)
+    for line in regressions:
+        print(f"РЕГРЕСІЯ {line}")
+    if not regressions:
+        print("Регресій не виявлено.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
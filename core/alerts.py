@@ -0,0 +1,155 @@
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.storage import RateStore
+
+# Типи правил
+LEVEL_ABOVE = "above"        # курс вище рівня
+LEVEL_BELOW = "below"        # курс нижче рівня
+PCT_CHANGE = "pct_change"    # зміна у % відносно курсу N днів тому (за модулем)
+SMA_CROSS = "sma_cross"      # перетин ковзної середньої за N днів
+
+RULE_KINDS = (LEVEL_ABOVE, LEVEL_BELOW, PCT_CHANGE, SMA_CROSS)
+
+
+class AlertEngine:
+    """
+    Рушій сповіщень. Правила зберігаються як список словників
+    {"currency", "kind", "value", "days"} і компілюються в масиви NumPy,
+    тож кожен новий знімок курсів перевіряється одним векторним проходом.
+    Опорні значення з історії (курс N днів тому, SMA) рахуються раз на день.
+    """
+
+    def __init__(self, rules: List[dict], store: Optional[RateStore] = None) -> None:
+        self.store = store or RateStore.instance()
+        self.rules = [rule for rule in rules if rule.get("kind") in RULE_KINDS]
+        self._reference_day: Optional[date] = None
+        self._last_side: Optional[np.ndarray] = None
+        self._last_fired: Optional[np.ndarray] = None
+        self._compile()
+
+    def _compile(self) -> None:
+        self.codes = sorted({rule["currency"] for rule in self.rules})
+        code_index = {code: i for i, code in enumerate(self.codes)}
+
+        self.rule_code = np.array([code_index[rule["currency"]] for rule in self.rules], dtype=np.intp)
+        self.rule_kind = np.array([RULE_KINDS.index(rule["kind"]) for rule in self.rules], dtype=np.intp)
+        self.rule_value = np.array([float(rule.get("value", 0)) for rule in self.rules], dtype=np.float64)
+        self.rule_days = np.array([max(1, int(rule.get("days", 1))) for rule in self.rules], dtype=np.intp)
+        self.reference = np.full(len(self.rules), np.nan)
+        self._last_fired = np.zeros(len(self.rules), dtype=bool)
+
+    def _refresh_reference(self, today: date) -> None:
+        """
+        Порахувати опорні значення з історії: курс N днів тому для PCT_CHANGE
+        і SMA за N днів для SMA_CROSS. Виконується раз на день.
+        """
+        self._reference_day = today
+        self._last_side = np.zeros(len(self.rules))
+        self.reference[:] = np.nan
+
+        needs_history = np.isin(self.rule_kind, (RULE_KINDS.index(PCT_CHANGE), RULE_KINDS.index(SMA_CROSS)))
+        if not needs_history.any():
+            return
+
+        max_days = int(self.rule_days[needs_history].max())
+        start = today - timedelta(days=max_days)
+        # Ряди по валютах, вирівняні по днях: стовпець i — дата start + i
+        history = np.full((len(self.codes), max_days), np.nan)
+        for i, code in enumerate(self.codes):
+            dates, rates = self.store.get_series(code, start, today - timedelta(days=1))
+            if dates:
+                offsets = np.array([(d - start).days for d in dates], dtype=np.intp)
+                history[i, offsets] = rates
+
+        # Прогалини (вихідні, пропущені дні) заповнюємо останнім відомим курсом
+        filled = history.copy()
+        for col in range(1, max_days):
+            gap = np.isnan(filled[:, col])
+            filled[gap, col] = filled[gap, col - 1]
+
+        # Суми за останні N днів через кумулятивні суми — без циклу по правилах
+        known = ~np.isnan(history)
+        csum = np.concatenate([np.zeros((len(self.codes), 1)), np.cumsum(np.where(known, history, 0), axis=1)], axis=1)
+        ccount = np.concatenate([np.zeros((len(self.codes), 1)), np.cumsum(known, axis=1)], axis=1)
+        window_start = max_days - self.rule_days
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sma = (csum[self.rule_code, max_days] - csum[self.rule_code, window_start]) / \
+                  (ccount[self.rule_code, max_days] - ccount[self.rule_code, window_start])
+
+        is_pct = self.rule_kind == RULE_KINDS.index(PCT_CHANGE)
+        is_cross = self.rule_kind == RULE_KINDS.index(SMA_CROSS)
+        self.reference[is_pct] = filled[self.rule_code, window_start][is_pct]
+        self.reference[is_cross] = sma[is_cross]
+
+        # Початкове положення курсу відносно SMA — за останнім відомим днем
+        last_close = filled[self.rule_code, max_days - 1]
+        with np.errstate(invalid="ignore"):
+            side = np.sign(last_close - self.reference)
+        self._last_side = np.where(is_cross & ~np.isnan(side), side, 0)
+
+    def evaluate(self, snapshot: Dict[str, float], today: Optional[date] = None) -> List[dict]:
+        """
+        Перевірити всі правила на знімку курсів {код: курс}.
+
+        :return: список спрацьованих правил з поточним курсом і текстом повідомлення
+        """
+        if not self.rules:
+            return []
+
+        today = today or date.today()
+        if self._reference_day != today:
+            self._refresh_reference(today)
+
+        current_by_code = np.array([snapshot.get(code, np.nan) for code in self.codes], dtype=np.float64)
+        current = current_by_code[self.rule_code]
+        kind = self.rule_kind
+        value = self.rule_value
+        reference = self.reference
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = (current - reference) / reference * 100
+            side = np.sign(current - reference)
+
+            fired = np.zeros(len(self.rules), dtype=bool)
+            fired |= (kind == RULE_KINDS.index(LEVEL_ABOVE)) & (current > value)
+            fired |= (kind == RULE_KINDS.index(LEVEL_BELOW)) & (current < value)
+            fired |= (kind == RULE_KINDS.index(PCT_CHANGE)) & (np.abs(pct) >= value)
+
+            # Перетин SMA: знак (курс - SMA) змінився відносно попереднього знімка
+            is_cross = kind == RULE_KINDS.index(SMA_CROSS)
+            valid_side = ~np.isnan(side) & (side != 0)
+            fired |= is_cross & valid_side & (self._last_side != 0) & (side != self._last_side)
+            self._last_side = np.where(is_cross & valid_side, side, self._last_side)
+
+        fired &= ~np.isnan(current)
+        # Рівневі правила повідомляють лише про вхід в умову, а не на кожному знімку
+        new = fired & (is_cross | ~self._last_fired)
+        self._last_fired = fired
+
+        matches = []
+        for idx in np.flatnonzero(new):
+            rule = self.rules[idx]
+            matches.append({
+                **rule,
+                "rate": float(current[idx]),
+                "message": self._describe(rule, float(current[idx]), float(pct[idx]))
+            })
+        if matches:
+            logging.info(f"Спрацювало сповіщень: {len(matches)}")
+        return matches
+
+    @staticmethod
+    def _describe(rule: dict, rate: float, pct: float) -> str:
+        code = rule["currency"]
+        kind = rule["kind"]
+        if kind == LEVEL_ABOVE:
+            return f"{code}: курс {rate:.4f} вище рівня {rule['value']}"
+        if kind == LEVEL_BELOW:
+            return f"{code}: курс {rate:.4f} нижче рівня {rule['value']}"
+        if kind == PCT_CHANGE:
+            return f"{code}: зміна {pct:+.2f}% за {rule.get('days', 1)} дн. (курс {rate:.4f})"
+        return f"{code}: курс {rate:.4f} перетнув SMA({rule.get('days', 1)})"
@@ -0,0 +1,94 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+    QTableWidget, QTableWidgetItem, QComboBox, QHeaderView
+)
+
+from core.alerts import RULE_KINDS
+from core.settings import SettingsService
+
+KIND_TITLES = {
+    "above": "Курс вище",
+    "below": "Курс нижче",
+    "pct_change": "Зміна, %",
+    "sma_cross": "Перетин SMA"
+}
+
+
+class AlertsDialog(QDialog):
+    """
+    Редагування правил сповіщень. Правила зберігаються в налаштуваннях
+    під ключем "alerts".
+    """
+
+    def __init__(self, parent=None, settings_service=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("Сповіщення")
+        self.resize(520, 360)
+
+        self.settings_service = settings_service or SettingsService.instance()
+        self.init_ui()
+        for rule in self.settings_service.get("alerts", []):
+            self.add_row(rule)
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Валюта", "Умова", "Значення", "Днів"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        btn_add = QPushButton("Додати")
+        btn_remove = QPushButton("Видалити")
+        btn_ok = QPushButton("OK")
+        btn_cancel = QPushButton("Вiдмiна")
+
+        btn_add.clicked.connect(lambda: self.add_row({"currency": "USD", "kind": "above", "value": 0, "days": 1}))
+        btn_remove.clicked.connect(lambda: self.table.removeRow(self.table.currentRow()))
+        btn_ok.clicked.connect(self.accept)
+        btn_cancel.clicked.connect(self.reject)
+
+        btn_layout.addWidget(btn_add)
+        btn_layout.addWidget(btn_remove)
+        btn_layout.addStretch()
+        btn_layout.addWidget(btn_ok)
+        btn_layout.addWidget(btn_cancel)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+    def add_row(self, rule: dict) -> None:
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(rule.get("currency", "")))
+
+        kind_combo = QComboBox()
+        for kind in RULE_KINDS:
+            kind_combo.addItem(KIND_TITLES[kind], kind)
+        kind_combo.setCurrentIndex(RULE_KINDS.index(rule.get("kind", "above")))
+        self.table.setCellWidget(row, 1, kind_combo)
+
+        self.table.setItem(row, 2, QTableWidgetItem(str(rule.get("value", 0))))
+        self.table.setItem(row, 3, QTableWidgetItem(str(rule.get("days", 1))))
+
+    def selected_rules(self) -> list:
+        rules = []
+        for row in range(self.table.rowCount()):
+            try:
+                rules.append({
+                    "currency": self.table.item(row, 0).text().strip().upper(),
+                    "kind": self.table.cellWidget(row, 1).currentData(),
+                    "value": float(self.table.item(row, 2).text().replace(",", ".")),
+                    "days": int(self.table.item(row, 3).text())
+                })
+            except (AttributeError, ValueError):
+                continue  # неповний або некоректний рядок
+        return [rule for rule in rules if rule["currency"]]
+
+    def exec_and_save(self) -> bool:
+        if self.exec() == QDialog.Accepted:
+            self.settings_service.set("alerts", self.selected_rules())
+            return True
+        return False
@@ -0,0 +1,151 @@
+from datetime import date
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.archive import RateArchive
+from core.storage import RateStore
+
+# Мінімальна частка спостережень, щоб валюта потрапила в аналіз
+MIN_COVERAGE = 0.5
+
+
+def load_matrix(
+    store: RateStore,
+    start_date: date,
+    end_date: date,
+    codes: Optional[Sequence[str]] = None
+) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Вирівняти всі збережені ряди в одну матрицю курсів.
+
+    :return: (дні-ординали, коди валют, матриця днів × валют з NaN на місці прогалин)
+    """
+    # Колонковий архів віддає матрицю зрізами memmap без побудови рядків SQLite
+    return RateArchive.instance(store).matrix(start_date, end_date, codes)
+
+
+def load_matrix_sql(
+    store: RateStore,
+    start_date: date,
+    end_date: date,
+    codes: Optional[Sequence[str]] = None
+) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Те саме, що load_matrix, але прямо з таблиці rates (без архіву).
+    """
+    rows = store.get_period(start_date, end_date)
+    if not rows:
+        return np.empty(0, dtype=np.int64), [], np.empty((0, 0))
+
+    all_codes = sorted(set(codes) if codes else {cc for cc, _, _ in rows})
+    code_index = {code: i for i, code in enumerate(all_codes)}
+    count = len(rows)
+    row_pos = np.fromiter((code_index.get(cc, -1) for cc, _, _ in rows), dtype=np.intp, count=count)
+    row_days = np.fromiter((day for _, day, _ in rows), dtype=np.int64, count=count)
+    row_rates = np.fromiter((rate for _, _, rate in rows), dtype=np.float64, count=count)
+    known = row_pos >= 0
+
+    days, day_pos = np.unique(row_days[known], return_inverse=True)
+    matrix = np.full((len(days), len(all_codes)), np.nan)
+    matrix[day_pos, row_pos[known]] = row_rates[known]
+    return days, all_codes, matrix
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """
+    Заповнити прогалини попереднім відомим значенням по кожному стовпцю.
+    """
+    idx = np.where(np.isnan(matrix), 0, np.arange(len(matrix))[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return matrix[idx, np.arange(matrix.shape[1])]
+
+
+def compute_analytics(days: np.ndarray, codes: List[str], matrix: np.ndarray, window: int = 30) -> dict:
+    """
+    Кореляції, ковзна річна волатильність і просідання для всіх валют.
+
+    :param window: вікно ковзної волатильності (у спостереженнях)
+    :return: словник з кодами, матрицею кореляцій, рядами волатильності та таблицею показників
+    """
+    coverage = np.mean(~np.isnan(matrix), axis=0) if len(matrix) else np.zeros(len(codes))
+    keep = coverage >= MIN_COVERAGE
+    codes = [code for code, ok in zip(codes, keep) if ok]
+    prices = forward_fill(matrix[:, keep])
+
+    # Лог-доходності; рядки до першого відомого курсу дають NaN і вважаються нулем
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.diff(np.log(prices), axis=0)
+    returns = np.where(np.isfinite(returns), returns, 0.0)
+
+    n = len(returns)
+    span_years = max((days[-1] - days[0]) / 365.25, 1 / 365.25) if len(days) > 1 else 1.0
+    periods_per_year = n / span_years if n else 252.0
+
+    if n > 1:
+        corr = np.corrcoef(returns, rowvar=False)
+        corr = np.atleast_2d(np.nan_to_num(corr))
+    else:
+        corr = np.eye(len(codes))
+
+    # Ковзне стандартне відхилення через кумулятивні суми — один прохід
+    window = max(2, min(window, n)) if n else window
+    csum = np.cumsum(np.vstack([np.zeros((1, len(codes))), returns]), axis=0)
+    csum2 = np.cumsum(np.vstack([np.zeros((1, len(codes))), returns ** 2]), axis=0)
+    if n >= window:
+        mean = (csum[window:] - csum[:-window]) / window
+        var = (csum2[window:] - csum2[:-window]) / window - mean ** 2
+        rolling_vol = np.sqrt(np.clip(var, 0, None) * window / (window - 1) * periods_per_year)
+    else:
+        rolling_vol = np.empty((0, len(codes)))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        peaks = np.fmax.accumulate(prices, axis=0)
+        drawdown = prices / peaks - 1
+        max_drawdown = np.nan_to_num(np.nanmin(drawdown, axis=0)) if len(prices) else np.zeros(len(codes))
+        total_return = prices[-1] / prices[np.argmax(~np.isnan(prices), axis=0), np.arange(len(codes))] - 1 \
+            if len(prices) else np.zeros(len(codes))
+
+    latest_vol = rolling_vol[-1] if len(rolling_vol) else np.full(len(codes), np.nan)
+    order = np.argsort(-np.nan_to_num(latest_vol, nan=-1))
+    table = [
+        {
+            "currency": codes[i],
+            "volatility": float(latest_vol[i]),
+            "max_drawdown": float(max_drawdown[i]),
+            "total_return": float(total_return[i])
+        }
+        for i in order
+    ]
+
+    return {
+        "codes": codes,
+        "days": days,
+        "corr": corr,
+        "rolling_vol": rolling_vol,
+        "drawdown": drawdown,
+        "table": table
+    }
+
+
+@lru_cache(maxsize=16)
+def _cached_analytics(store: RateStore, start: int, end: int, codes: Tuple[str, ...], window: int, version: int) -> dict:
+    days, all_codes, matrix = load_matrix(store, date.fromordinal(start), date.fromordinal(end), codes or None)
+    return compute_analytics(days, all_codes, matrix, window)
+
+
+def get_analytics(
+    start_date: date,
+    end_date: date,
+    codes: Optional[Sequence[str]] = None,
+    window: int = 30,
+    store: Optional[RateStore] = None
+) -> dict:
+    """
+    Аналітика за період із кешем на (період, набір валют). Кеш скидається
+    автоматично, щойно в сховище додаються нові курси.
+    """
+    store = store or RateStore.instance()
+    key_codes = tuple(sorted(set(codes))) if codes else ()
+    return _cached_analytics(store, start_date.toordinal(), end_date.toordinal(), key_codes, window, store.version)
@@ -0,0 +1,129 @@
+from typing import Optional
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel,
+    QTableWidget, QTableWidgetItem, QHeaderView, QSplitter
+)
+
+from core.workers import AnalyticsWorker, retire_worker
+
+
+class AnalyticsDialog(QDialog):
+    """
+    Кореляції та волатильність усіх збережених валют: теплова карта
+    кореляцій і таблиця, впорядкована за поточною волатильністю.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("Аналітика валют")
+        self.resize(1000, 620)
+        self.worker: Optional[AnalyticsWorker] = None
+        self._pending = False  # період змінили, поки йшов розрахунок
+
+        self.init_ui()
+        self.start_worker()
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        top_bar = QHBoxLayout()
+        top_bar.addWidget(QLabel("Період:"))
+        self.period_combo = QComboBox()
+        self.period_combo.addItem("90 днів", 90)
+        self.period_combo.addItem("1 рік", 365)
+        self.period_combo.addItem("5 років", 5 * 365)
+        self.period_combo.addItem("Увесь архів", 100 * 365)
+        self.period_combo.setCurrentIndex(1)
+        self.period_combo.currentIndexChanged.connect(self.start_worker)
+        top_bar.addWidget(self.period_combo)
+        top_bar.addStretch()
+        self.status_label = QLabel()
+        top_bar.addWidget(self.status_label)
+        layout.addLayout(top_bar)
+
+        splitter = QSplitter(QtCore.Qt.Horizontal)
+
+        self.figure = Figure(figsize=(6, 5))
+        self.canvas = FigureCanvas(self.figure)
+        splitter.addWidget(self.canvas)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Валюта", "Волатильність, %", "Макс. просідання, %", "Зміна, %"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        splitter.addWidget(self.table)
+        splitter.setSizes([600, 400])
+
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def start_worker(self) -> None:
+        if self.worker and self.worker.isRunning():
+            # Перерахунок запуститься, щойно завершиться поточний
+            self._pending = True
+            return
+        self._pending = False
+        self.status_label.setText("Розрахунок...")
+        self.worker = AnalyticsWorker(self.period_combo.currentData())
+        self.worker.finished.connect(self.on_ready)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+
+    def _restart_if_pending(self) -> bool:
+        if not self._pending:
+            return False
+        # Чекаємо справжнього завершення потоку: сигнал finished надходить ще з run()
+        self.worker.wait()
+        self.start_worker()
+        return True
+
+    def on_error(self, message: str) -> None:
+        if not self._restart_if_pending():
+            self.status_label.setText(message)
+
+    def on_ready(self, result: dict) -> None:
+        # Результат за попередній період уже неактуальний
+        if self._restart_if_pending():
+            return
+
+        codes = result["codes"]
+        self.status_label.setText(f"Валют: {len(codes)}, днів: {len(result['days'])}")
+
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        image = ax.imshow(result["corr"], cmap="RdBu_r", vmin=-1, vmax=1)
+        ax.set_xticks(range(len(codes)))
+        ax.set_yticks(range(len(codes)))
+        ax.set_xticklabels(codes, rotation=90, fontsize=6)
+        ax.set_yticklabels(codes, fontsize=6)
+        ax.set_title("Кореляція денних змін")
+        self.figure.colorbar(image, ax=ax)
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(result["table"]))
+        for row, stats in enumerate(result["table"]):
+            values = (stats["volatility"], stats["max_drawdown"], stats["total_return"])
+            self.table.setItem(row, 0, QTableWidgetItem(stats["currency"]))
+            for col, value in enumerate(values, start=1):
+                item = QTableWidgetItem()
+                item.setData(QtCore.Qt.DisplayRole, round(value * 100, 2))
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+
+    def done(self, result: int) -> None:
+        # Викликається і при закритті вікна, і при Esc (на відміну від closeEvent).
+        # Розрахунок не чекаємо в GUI-потоці: воркер утримується до завершення
+        if self.worker and self.worker.isRunning():
+            self.worker.finished.disconnect()
+            self.worker.error.disconnect()
+            retire_worker(self.worker)
+        self.worker = None
+        self._pending = False
+        super().done(result)
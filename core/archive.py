@@ -0,0 +1,230 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.storage import RateStore, Row
+
+# Гривня введена 02.09.1996 — раніше історії курсів NBU немає
+ARCHIVE_START = date(1996, 9, 2)
+DTYPE = np.dtype("<f8")
+META_FILE = "meta.json"
+# Готовий блок NaN для подовження файлів без виділення пам'яті під весь проміжок
+_NAN_BLOCK = np.full(8192, np.nan, dtype=DTYPE).tobytes()
+
+
+class RateArchive:
+    """
+    Колонковий архів курсів поруч із RateStore: на кожну валюту файл <CC>.f64
+    з float64 на кожен календарний день від ARCHIVE_START (NaN — курсу немає).
+    Позиція дня в файлі — day.toordinal() - ARCHIVE_START.toordinal(), тож
+    пошук за датою O(1), а діапазон читається зрізом numpy.memmap без копіювання.
+    Нові курси дописуються на місці через підписку на RateStore.
+    """
+
+    _instances: Dict[str, "RateArchive"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, store: Optional[RateStore] = None, path: Optional[str] = None) -> None:
+        self.store = store or RateStore.instance()
+        if path is None and self.store.path == ":memory:":
+            # Сховище в пам'яті отримує тимчасовий архів, що видаляється разом з об'єктом
+            path = tempfile.mkdtemp(prefix="rates-archive-")
+            weakref.finalize(self, shutil.rmtree, path, ignore_errors=True)
+        elif path is None:
+            path = os.path.splitext(self.store.path)[0] + "_archive"
+        self.path = path
+        self.start = ARCHIVE_START.toordinal()
+        self._lock = threading.Lock()
+        self._maps: Dict[str, np.memmap] = {}
+        # Скільки рядків сховища вже враховано в архіві (дублюється в meta.json)
+        self._rows = 0
+
+        # Підписка до перебудови: вставки з інших потоків під час неї чекають на замку
+        # і дописуються поверх, а не губляться
+        self.store.add_listener(self.append)
+
+        # Архів перебудовується, якщо відстав від сховища (наприклад, після імпорту в іншому процесі);
+        # для порожнього сховища нічого не створюється до першої вставки
+        rows = self.store.count()
+        if rows or os.path.isdir(path):
+            meta = self._load_meta()
+            if meta.get("start") != self.start or meta.get("rows") != rows:
+                self.rebuild()
+            else:
+                self._rows = rows
+
+    @classmethod
+    def instance(cls, store: Optional[RateStore] = None) -> "RateArchive":
+        store = store or RateStore.instance()
+        # Під замком: інакше кілька воркерів одночасно створять архіви з окремими слухачами
+        with cls._instances_lock:
+            archive = cls._instances.get(store.path)
+            if archive is None or archive.store is not store:
+                archive = cls._instances[store.path] = cls(store)
+            return archive
+
+    def _file(self, code: str) -> str:
+        return os.path.join(self.path, f"{code}.f64")
+
+    # Небуферизований ввід-вивід: meta.json крихітний, а буфер файлу — 8 КБ на кожну вставку
+    def _load_meta(self) -> dict:
+        try:
+            with open(os.path.join(self.path, META_FILE), "rb", buffering=0) as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, meta: dict) -> None:
+        # Без тимчасового файлу: пошкоджений meta.json не читається, і архів просто перебудується
+        with open(os.path.join(self.path, META_FILE), "wb", buffering=0) as f:
+            f.write(json.dumps(meta).encode("utf-8"))
+
+    def codes(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.path) if name.endswith(".f64"))
+
+    def rebuild(self) -> None:
+        """
+        Перезаписати архів з нуля за даними сховища.
+        """
+        with self._lock:
+            self._maps.clear()
+            os.makedirs(self.path, exist_ok=True)
+            for code in self.codes():
+                os.remove(self._file(code))
+
+            columns: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+            for cc, day, rate in self.store.connection().execute("SELECT cc, day, rate FROM rates"):
+                if day >= self.start:
+                    columns[cc].append((day - self.start, rate))
+            for code, points in columns.items():
+                index = np.fromiter((i for i, _ in points), dtype=np.int64, count=len(points))
+                column = np.full(int(index.max()) + 1, np.nan, dtype=DTYPE)
+                column[index] = [rate for _, rate in points]
+                column.tofile(self._file(code))
+            self._rows = self.store.count()
+            self._save_meta({"start": self.start, "rows": self._rows})
+
+    def append(self, rows: Iterable[Row]) -> None:
+        """
+        Дописати нові курси в файли валют на місці; файл подовжується NaN до потрібного дня.
+        """
+        count = 0
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            # Рядки йдуть підряд по днях, тож пишемо суміжні відрізки без проміжних словників
+            run_code, run_start, run = "", 0, []
+            for cc, day, rate in rows:
+                count += 1
+                index = day.toordinal() - self.start
+                if index < 0:
+                    continue
+                if cc != run_code or index != run_start + len(run):
+                    self._write_run(run_code, run_start, run)
+                    run_code, run_start, run = cc, index, []
+                run.append(rate)
+            self._write_run(run_code, run_start, run)
+
+            self._rows += count
+            self._save_meta({"start": self.start, "rows": self._rows})
+
+    def _write_run(self, code: str, first: int, rates: List[float]) -> None:
+        if not rates:
+            return
+        # Сирий дескриптор замість memmap: відкриття memmap дорожче за пару write().
+        # Сторінки файлу спільні з кешем ОС, тож відкриті memmap читачів бачать запис одразу
+        fd = os.open(self._file(code), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0))
+        try:
+            gap = first * DTYPE.itemsize - os.lseek(fd, 0, os.SEEK_END)
+            block = memoryview(_NAN_BLOCK)
+            while gap > 0:
+                os.write(fd, block[:min(gap, len(block))])
+                gap -= len(block)
+            os.lseek(fd, first * DTYPE.itemsize, os.SEEK_SET)
+            os.write(fd, np.array(rates, dtype=DTYPE).tobytes())
+        finally:
+            os.close(fd)
+        self._maps.pop(code, None)
+
+    def column(self, code: str) -> np.ndarray:
+        """
+        Весь ряд валюти як read-only memmap (порожній масив, якщо валюти немає).
+        """
+        path = self._file(code)
+        size = os.path.getsize(path) // DTYPE.itemsize if os.path.exists(path) else 0
+        with self._lock:
+            mapped = self._maps.get(code)
+            # Файл міг подовжитися в іншому процесі: тоді відкриваємо заново
+            if mapped is None or len(mapped) != size:
+                mapped = np.memmap(path, dtype=DTYPE, mode="r") if size else np.empty(0, dtype=DTYPE)
+                self._maps[code] = mapped
+            return mapped
+
+    def _slice(self, code: str, start_date: date, end_date: date) -> Tuple[int, np.ndarray]:
+        column = self.column(code)
+        first = max(start_date.toordinal() - self.start, 0)
+        last = min(end_date.toordinal() - self.start + 1, len(column))
+        return first, column[first:max(first, last)]
+
+    def lookup(self, code: str, days: Sequence[date]) -> np.ndarray:
+        """
+        Курси на вказані дати (NaN, якщо курсу в архіві немає).
+        """
+        column = self.column(code)
+        index = np.fromiter((day.toordinal() - self.start for day in days), dtype=np.int64, count=len(days))
+        values = np.full(len(index), np.nan)
+        inside = (index >= 0) & (index < len(column))
+        values[inside] = column[index[inside]]
+        return values
+
+    def get_arrays(self, code: str, start_date: date, end_date: date) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Відомі курси за період як масиви (дні-ординали, курси) без NaN.
+        """
+        first, values = self._slice(code, start_date, end_date)
+        known = ~np.isnan(values)
+        return np.flatnonzero(known) + first + self.start, np.asarray(values[known])
+
+    def get_series(self, code: str, start_date: date, end_date: date) -> Tuple[List[date], List[float]]:
+        """
+        Те саме, що RateStore.get_series, але з архіву.
+        """
+        days, rates = self.get_arrays(code, start_date, end_date)
+        return [date.fromordinal(int(day)) for day in days], rates.tolist()
+
+    def matrix(
+        self,
+        start_date: date,
+        end_date: date,
+        codes: Optional[Sequence[str]] = None
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Матриця днів × валют за період; лишаються лише дні, де є хоч один курс.
+
+        :return: (дні-ординали, коди валют, матриця з NaN на місці прогалин)
+        """
+        all_codes = sorted(set(codes) if codes else self.codes())
+        first = max(start_date.toordinal() - self.start, 0)
+        length = max(end_date.toordinal() - self.start + 1 - first, 0)
+        matrix = np.full((length, len(all_codes)), np.nan)
+        for i, code in enumerate(all_codes):
+            _, values = self._slice(code, start_date, end_date)
+            matrix[:len(values), i] = values
+
+        if not codes:
+            # Як і в SQL-вибірці: лише валюти, що мають курси за період
+            present = ~np.isnan(matrix).all(axis=0)
+            all_codes = [code for code, ok in zip(all_codes, present) if ok]
+            matrix = matrix[:, present]
+        has_data = ~np.isnan(matrix).all(axis=1)
+        days = np.flatnonzero(has_data) + first + self.start
+        return days, all_codes, matrix[has_data]
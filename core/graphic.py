@@ -1,15 +1,34 @@
-import requests
 from datetime import datetime, timedelta, date
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 import logging
+import numpy as np
 from typing import List, Tuple, Optional
 
+from core.logs import log_timing
+from core.ratelimit import RateLimitedSession, nbu_session
+from core.archive import RateArchive
+from core.storage import RateStore, Row
+from core.resample import daily_bars
+
 
 class NBUExchangeRates:
     BASE_URL = "https://bank.gov.ua/NBUStatService/v1/statdirectory/exchange"
 
-    def __init__(self, currency_code: str = "USD"):
+    def __init__(
+        self,
+        currency_code: str = "USD",
+        session: Optional[RateLimitedSession] = None,
+        store: Optional[RateStore] = None,
+        archive: Optional[RateArchive] = None
+    ):
         self.currency_code = currency_code
+        self.session = session or nbu_session
+        self.store = store or RateStore.instance()
+        self.archive = archive or RateArchive.instance(self.store)
+        # Дати останнього запиту, на які сервер не відповів (помилка HTTP, розімкнений
+        # запобіжник): їх варто запитати знову, на відміну від дат без курсу у відповіді
+        self.failed_dates: List[date] = []
 
     def get_rates(self, days: int = 30) -> Tuple[Optional[List[date]], Optional[List[float]]]:
         """
@@ -20,32 +39,86 @@ class NBUExchangeRates:
         """
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days)
+        return self.get_rates_for_period(start_date, end_date)
+
+    def get_rates_for_dates(self, wanted: List[date]) -> Tuple[Optional[List[date]], Optional[List[float]]]:
+        """
+        Получить курсы на указанные даты. Даты, уже сохраненные в локальном
+        хранилище, берутся из его колонкового архива (поиск по дате за O(1));
+        остальные запрашиваются у NBU и сохраняются.
+
+        :param wanted: Отсортированный список дат
+        :return: Кортеж списков (даты, курсы) или (None, None) при ошибке;
+                 даты без ответа сервера — в self.failed_dates
+        """
+        self.failed_dates = failed = []
+        if not wanted:
+            return None, None
 
         dates: List[date] = []
         rates: List[float] = []
+        missing: List[date] = []
+        last_error: Optional[Exception] = None
+        fetched: List[Row] = []
 
         try:
-            for day_offset in range(days + 1):
-                current_date = start_date + timedelta(days=day_offset)
-                date_str = current_date.strftime('%Y%m%d')
-                url = f"{self.BASE_URL}?valcode={self.currency_code}&date={date_str}&json"
+            with log_timing("NBU get_rates", currency=self.currency_code, days=len(wanted)) as fields:
+                known = self.archive.lookup(self.currency_code, wanted)
+                found = ~np.isnan(known)
+                stored = dict(zip((wanted[i] for i in np.flatnonzero(found).tolist()), known[found].tolist()))
+                if len(stored) < len(wanted):
+                    # Архів міг відстати від сховища (наприклад, імпорт з іншого процесу):
+                    # перед запитами до NBU перевіряємо SQLite і дописуємо знайдене в архів
+                    gaps = np.flatnonzero(~found)
+                    backfill = [
+                        (self.currency_code, day, rate)
+                        for day, rate in zip(*self.store.get_series(self.currency_code, wanted[gaps[0]], wanted[gaps[-1]]))
+                        if day not in stored
+                    ]
+                    if backfill:
+                        stored.update((day, rate) for _, day, rate in backfill)
+                        self.archive.append(backfill)
 
-                response = requests.get(url)
-                if response.status_code != 200:
-                    logging.error(f"HTTP ошибка {response.status_code} для даты {current_date}")
-                    continue
+                for current_date in wanted:
+                    if current_date in stored:
+                        dates.append(current_date)
+                        rates.append(stored[current_date])
+                        continue
+
+                    date_str = current_date.strftime('%Y%m%d')
+                    url = f"{self.BASE_URL}?valcode={self.currency_code}&date={date_str}&json"
 
-                data = response.json()
+                    try:
+                        data = self.session.get_json(url)
+                    except Exception as e:  # включно з CircuitOpenError
+                        failed.append(current_date)
+                        last_error = e
+                        continue
 
-                if data and isinstance(data, list):
-                    rate = data[0].get('rate')
+                    rate = data[0].get('rate') if data and isinstance(data, list) else None
                     if rate is not None:
                         dates.append(current_date)
                         rates.append(rate)
+                        fetched.append((self.currency_code, current_date, rate))
                     else:
-                        logging.warning(f"Отсутствует курс для {self.currency_code} на дату {current_date}")
-                else:
-                    logging.warning(f"Пустой или некорректный ответ для даты {current_date}")
+                        missing.append(current_date)
+
+                self.store.insert_many(fetched)
+                fields["requests"] = len(wanted) - len(stored)
+                fields["points"] = len(dates)
+                fields["missing"] = len(missing)
+
+            # Одне зведене повідомлення замість окремого на кожну дату
+            if failed:
+                logging.error(
+                    f"HTTP ошибка для {self.currency_code} на {len(failed)} дат(ы): "
+                    f"{failed[0]} … {failed[-1]}; последняя: {last_error}"
+                )
+            if missing:
+                logging.warning(
+                    f"Отсутствует курс для {self.currency_code} на {len(missing)} дат(ы): "
+                    f"{missing[0]} … {missing[-1]}"
+                )
 
             if not dates or not rates:
                 logging.error("Нет данных для выбранного периода")
@@ -55,6 +128,7 @@ class NBUExchangeRates:
 
         except Exception as e:
             logging.error(f"Ошибка при запросе данных с NBU: {e}", exc_info=True)
+            self.failed_dates = list(wanted)
             return None, None
 
     def plot_rates(self, dates: List[date], rates: List[float]) -> None:
@@ -91,10 +165,91 @@ class NBUExchangeRates:
             logging.error("Ошибка: начальная дата позже конечной")
             return None, None
 
-        # Используем существующий метод для получения данных за последние delta_days
-        # Сдвигаем даты к началу периода, так что вызов get_rates возвращает нужный период
-        # Для корректности лучше написать отдельный метод, но для простоты здесь вызовем get_rates
-        return self.get_rates(days=delta_days)
+        wanted = [start_date + timedelta(days=offset) for offset in range(delta_days + 1)]
+        return self.get_rates_for_dates(wanted)
+
+
+def draw_rates(
+    ax,
+    dates: List[date],
+    rates: List[float],
+    chart_settings: dict,
+    bars: Optional[dict] = None,
+    forecast: Optional[dict] = None
+) -> None:
+    """
+    Нарисовать курс на осях matplotlib согласно настройкам графика
+    (тип, цвет, сетка, SMA). Используется и окном приложения, и фоновым рендером.
+
+    :param ax: Оси matplotlib
+    :param dates: Список дат
+    :param rates: Список курсов
+    :param chart_settings: Настройки графика из SettingsService
+    :param bars: OHLC-бары для свечного графика (по умолчанию строятся из курсов)
+    :param forecast: Прогноз с интервалом из RatePredictor.predict_interval
+    """
+    line_color = chart_settings.get("line_color", "#2d78d8")
+    chart_type = chart_settings.get("chart_type", "Лінійний")
+    show_grid = chart_settings.get("show_grid", True)
+    show_sma = chart_settings.get("show_sma", False)
+
+    if chart_type == "Лінійний":
+        ax.plot(dates, rates, label="Курс", color=line_color)
+    elif chart_type == "Баровий":
+        ax.bar(dates, rates, label="Баровий", color=line_color)
+    elif chart_type == "Точечний":
+        ax.scatter(dates, rates, label="Точечний", color=line_color)
+    elif chart_type == "Діаграмма розбросу":
+        ax.scatter(dates, rates, label='Курс (точки)', color=line_color)
+    elif chart_type == "Свічковий":
+        draw_candlestick(ax, bars or daily_bars(dates, rates), color=line_color)
+
+    if show_sma and len(rates) >= 5:
+        window = 5
+        sma = [sum(rates[i - window:i]) / window for i in range(window, len(rates) + 1)]
+        ax.plot(dates[window - 1:], sma, label="SMA", linestyle="--", color="orange")
+
+    if forecast:
+        # Прогноз продолжает ряд от последней известной точки
+        forecast_dates = [dates[-1]] + forecast["dates"]
+        ax.fill_between(
+            forecast_dates, [rates[-1]] + forecast["lower"], [rates[-1]] + forecast["upper"],
+            color=line_color, alpha=0.2, label="95% інтервал"
+        )
+        ax.plot(forecast_dates, [rates[-1]] + forecast["prediction"], linestyle=":", color=line_color, label="Прогноз")
+
+    ax.legend()
+    ax.grid(show_grid)
+    ax.set_title("Динаміка курсу")
+    ax.set_xlabel("Дата")
+    ax.set_ylabel("Курс")
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d-%m-%Y"))
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+    ax.figure.autofmt_xdate()
+
+
+def draw_candlestick(ax, bars: dict, color: str = "#2d78d8", down_color: str = "#d8452d") -> None:
+    """
+    Нарисовать свечной график OHLC на осях matplotlib.
+
+    :param ax: Оси matplotlib
+    :param bars: Словарь списков dates, open, high, low, close
+    :param color: Цвет растущих свечей
+    :param down_color: Цвет падающих свечей
+    """
+    dates = bars["dates"]
+    if not dates:
+        return
+
+    # Ширина свечи — 60% от типичного шага между барами
+    steps = sorted((b - a).days for a, b in zip(dates, dates[1:])) or [1]
+    width = max(steps[len(steps) // 2], 1) * 0.6
+
+    colors = [color if c >= o else down_color for o, c in zip(bars["open"], bars["close"])]
+    ax.vlines(dates, bars["low"], bars["high"], colors=colors, linewidth=1)
+    bottoms = [min(o, c) for o, c in zip(bars["open"], bars["close"])]
+    heights = [max(abs(c - o), 1e-6) for o, c in zip(bars["open"], bars["close"])]
+    ax.bar(dates, heights, width=width, bottom=bottoms, color=colors, label="OHLC")
 
 
 if __name__ == "__main__":
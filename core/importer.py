@@ -0,0 +1,201 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import time
+from datetime import date, datetime
+from typing import IO, Iterator, List, Optional
+
+from core.storage import RateStore, Row
+
+CHUNK_SIZE = 1024 * 1024
+
+# Назви полів у JSON-відповідях NBU та в CSV-вивантаженнях з сайту
+CODE_FIELDS = ("cc", "Код літерний", "currency", "code")
+DATE_FIELDS = ("exchangedate", "Дата", "date")
+RATE_FIELDS = ("rate", "Офіційний курс гривні, грн", "Офіційний курс гривні", "Курс")
+UNITS_FIELDS = ("Кількість одиниць", "units")
+
+
+def _field(record: dict, names) -> Optional[str]:
+    for name in names:
+        value = record.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_date(value: str) -> date:
+    value = value.strip()
+    for fmt in ("%d.%m.%Y", "%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Невідомий формат дати: {value}")
+
+
+def normalize_record(record: dict) -> Optional[Row]:
+    """
+    Привести запис JSON/CSV до рядка сховища (валюта, дата, курс за 1 одиницю).
+    Повертає None, якщо запис неповний.
+    """
+    code = _field(record, CODE_FIELDS)
+    day = _field(record, DATE_FIELDS)
+    rate = _field(record, RATE_FIELDS)
+    if code is None or day is None or rate is None:
+        return None
+
+    rate = float(str(rate).replace(",", ".").replace(" ", ""))
+    units = _field(record, UNITS_FIELDS)
+    if units is not None:
+        rate /= float(units)
+    return str(code).strip().upper(), _parse_date(str(day)), rate
+
+
+def iter_json_records(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Потоково розібрати JSON-архів: послідовність масивів NBU (по одному на дату),
+    розділених пробілами/рядками, або зовнішній масив таких масивів чи записів.
+    У пам'яті тримається лише поточний фрагмент файлу.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    wrapped: Optional[bool] = None
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if not fill():
+                return
+            continue
+
+        if wrapped is None:
+            # Зовнішній масив, якщо після "[" йде ще один масив або об'єкт
+            rest = buf[pos + 1:].lstrip()
+            if not rest and not eof:
+                fill()
+                continue
+            wrapped = buf[pos] == "[" and rest[:1] in ("[", "{")
+            if wrapped:
+                pos += 1
+            continue
+
+        if wrapped and buf[pos] == "]":
+            # Кінець зовнішнього масиву; далі у файлі може йти наступний
+            pos += 1
+            wrapped = None
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+
+        pos = end
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    yield item
+        elif isinstance(value, dict):
+            yield value
+
+
+def iter_csv_records(f: IO[str]) -> Iterator[dict]:
+    """
+    Потоково прочитати CSV-вивантаження (роздільник визначається автоматично).
+    """
+    sample = f.read(4096)
+    f.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    yield from csv.DictReader(f, dialect=dialect)
+
+
+def import_file(
+    path: str,
+    store: Optional[RateStore] = None,
+    batch_size: int = 5000,
+    fmt: Optional[str] = None
+) -> dict:
+    """
+    Імпортувати офлайн-архів NBU (JSON або CSV) у локальне сховище курсів.
+
+    :param path: шлях до файлу
+    :param store: сховище (за замовчуванням спільне)
+    :param batch_size: кількість рядків в одній транзакції
+    :param fmt: "json" або "csv"; за замовчуванням — за розширенням файлу
+    :return: статистика імпорту (прочитано, додано, пропущено, секунди, рядків/с)
+    """
+    store = store or RateStore.instance()
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "json")
+
+    read = inserted = skipped = 0
+    batch: List[Row] = []
+    start = time.perf_counter()
+
+    with io.open(path, "r", encoding="utf-8-sig", newline="") as f:
+        records = iter_csv_records(f) if fmt == "csv" else iter_json_records(f)
+        for record in records:
+            try:
+                row = normalize_record(record)
+            except ValueError as e:
+                logging.warning(f"Пропущено некоректний запис в {os.path.basename(path)}: {e}")
+                row = None
+            if row is None:
+                skipped += 1
+                continue
+
+            read += 1
+            batch.append(row)
+            if len(batch) >= batch_size:
+                inserted += store.insert_many(batch)
+                batch.clear()
+
+        inserted += store.insert_many(batch)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": read,
+        "inserted": inserted,
+        "skipped": skipped,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(read / seconds) if seconds > 0 else read
+    }
+    logging.info(f"Імпорт {path} завершено", extra={"fields": stats})
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Імпорт архіву курсів NBU у локальне сховище")
+    parser.add_argument("paths", nargs="+", help="файли JSON або CSV")
+    parser.add_argument("--format", choices=("json", "csv"), default=None)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for file_path in args.paths:
+        result = import_file(file_path, batch_size=args.batch_size, fmt=args.format)
+        print(
+            f"{file_path}: прочитано {result['rows']}, додано {result['inserted']}, "
+            f"пропущено {result['skipped']} за {result['seconds']} с ({result['rows_per_sec']} рядків/с)"
+        )
@@ -0,0 +1,167 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(threadName)s - %(message)s%(fields)s"
+
+_listener: Optional[QueueListener] = None
+_repeat_filter: Optional["RepeatFilter"] = None
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Пригнічує попередження з одного місця виклику, що повторюються частіше
+    ніж раз на `window` секунд. Помилки не пригнічуються: у кожної свій текст
+    і traceback. Коли вікно спливає, окремим записом через `emit` пишеться,
+    скільки повторів пропущено і яким був останній.
+
+    Ключ — файл і рядок виклику, а не текст: f-рядки з датою чи помилкою
+    дають щоразу новий текст. Пам'ятається не більше `max_keys` місць виклику.
+    """
+
+    def __init__(self, emit: Callable[[logging.LogRecord], None], window: float = 60.0, max_keys: int = 1024) -> None:
+        super().__init__()
+        self.emit = emit
+        self.window = window
+        self.max_keys = max_keys
+        # ключ -> [початок вікна, пропущено, останній пропущений запис]; порядок — за початком вікна
+        self._seen: "OrderedDict[Tuple[str, str, int], list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        summaries: List[logging.LogRecord] = []
+        with self._lock:
+            # Вікна впорядковані за часом початку, тож прострочені — на початку
+            while self._seen and now - next(iter(self._seen.values()))[0] >= self.window:
+                self._close(self._seen.popitem(last=False), summaries)
+
+            passed = True
+            if record.levelno == logging.WARNING:
+                key = (record.name, record.pathname, record.lineno)
+                entry = self._seen.get(key)
+                if entry is not None:
+                    entry[1] += 1
+                    entry[2] = record
+                    passed = False
+                else:
+                    self._seen[key] = [now, 0, None]
+                    while len(self._seen) > self.max_keys:
+                        self._close(self._seen.popitem(last=False), summaries)
+
+        for summary in summaries:
+            self.emit(summary)
+        return passed
+
+    def flush(self) -> None:
+        """
+        Записати зведення для всіх відкритих вікон (при зупинці логування).
+        """
+        summaries: List[logging.LogRecord] = []
+        with self._lock:
+            while self._seen:
+                self._close(self._seen.popitem(last=False), summaries)
+        for summary in summaries:
+            self.emit(summary)
+
+    @staticmethod
+    def _close(item: tuple, summaries: List[logging.LogRecord]) -> None:
+        _key, (_start, suppressed, last) = item
+        if not suppressed:
+            return
+        summary = logging.makeLogRecord(last.__dict__)
+        summary.msg = "%s (повторів пропущено: %d)"
+        summary.args = (last.getMessage(), suppressed)
+        summary.exc_info = summary.exc_text = None
+        summaries.append(summary)
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Додає до повідомлення поля з `extra={"fields": {...}}` у вигляді key=value.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict) and fields:
+            record.fields = " | " + " ".join(f"{k}={v}" for k, v in fields.items())
+        elif not isinstance(fields, str):
+            record.fields = ""
+        return super().format(record)
+
+
+def setup_logging(
+    level: int = logging.DEBUG,
+    log_dir: str = LOG_DIR,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 5,
+    repeat_window: float = 60.0
+) -> QueueListener:
+    """
+    Налаштовує фонове логування: записи кладуться в чергу, а у файл
+    з ротацією за розміром їх пише окремий потік QueueListener.
+    """
+    global _listener, _repeat_filter
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(log_dir, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        os.path.join(log_dir, "app.log"),
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Зведення про пропущені повтори йдуть у чергу напряму, повз фільтр
+    _repeat_filter = RepeatFilter(queue_handler.emit, repeat_window)
+    queue_handler.addFilter(_repeat_filter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """
+    Зупиняє фоновий потік логування, дописавши всі записи з черги.
+    """
+    global _listener
+    if _listener is not None:
+        if _repeat_filter is not None:
+            _repeat_filter.flush()
+        _listener.stop()
+        _listener = None
+
+
+@contextmanager
+def log_timing(action: str, level: int = logging.DEBUG, **fields):
+    """
+    Вимірює тривалість блоку та пише структурований запис з полем elapsed_ms.
+    Усередині блоку можна доповнювати словник полів, що повертається.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        fields["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        logging.log(level, action, extra={"fields": fields})
@@ -0,0 +1,137 @@
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Optional
+
+from core.logs import LOG_DIR
+
+PROFILE_ENV = "KOSTIK_PROFILE"
+PROFILE_DIR = os.path.join(LOG_DIR, "profiles")
+SAMPLE_INTERVAL = 0.002  # секунд; фактично обмежено інтервалом перемикання GIL
+
+
+def env_enabled() -> bool:
+    """
+    Профілювання ввімкнено змінною середовища, наприклад KOSTIK_PROFILE=1.
+    """
+    return os.environ.get(PROFILE_ENV, "").strip().lower() not in ("", "0", "false", "no")
+
+
+_enabled = env_enabled()
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{code.co_name}:{code.co_firstlineno}"
+
+
+class StackSampler(threading.Thread):
+    """
+    Семплер стеку одного потоку: кожні `interval` секунд знімає його поточний
+    стек через sys._current_frames() і рахує однакові стеки.
+    """
+
+    def __init__(self, target_ident: int, interval: float = SAMPLE_INTERVAL) -> None:
+        super().__init__(name="StackSampler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def write_collapsed(stacks: Counter, action: str) -> str:
+    """
+    Записати стеки у форматі collapsed stacks («a;b;c 12» на рядок),
+    який читають flamegraph.pl, speedscope та inferno.
+
+    :return: шлях до створеного файлу
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_action = re.sub(r"[^\w.-]", "_", action)
+    path = os.path.join(PROFILE_DIR, f"{safe_action}_{datetime.now():%Y%m%d-%H%M%S-%f}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+@contextmanager
+def profile_action(action: str, **fields):
+    """
+    Профілювати блок коду поточного потоку, якщо профілювання ввімкнено.
+    Результат пишеться в logs/profiles/<action>_<час>.folded.
+    """
+    if not _enabled:
+        yield
+        return
+
+    sampler = StackSampler(threading.get_ident())
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        try:
+            path = write_collapsed(sampler.stacks, action)
+        except OSError as e:
+            logging.error(f"Не вдалося записати профіль {action}: {e}")
+        else:
+            logging.info(
+                f"Профіль {action} збережено",
+                extra={"fields": {"path": path, "samples": sum(sampler.stacks.values()), "elapsed_ms": elapsed_ms, **fields}}
+            )
+
+
+def profiled(action: Optional[str] = None) -> Callable:
+    """
+    Декоратор: профілювати кожен виклик функції, коли профілювання ввімкнено.
+    У вимкненому стані додає лише перевірку прапорця.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = action or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with profile_action(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
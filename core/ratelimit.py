@@ -0,0 +1,217 @@
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import requests
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """
+    Запит не виконано: запобіжник розімкнено після серії помилок сервера.
+    """
+
+
+class TokenBucket:
+    """
+    Спільний обмежувач частоти запитів (token bucket) з адаптивною швидкістю:
+    при відмовах сервера швидкість зменшується вдвічі, при успіхах поступово зростає.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        capacity: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        increase_step: float = 0.1
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """
+        Заблокувати потік, доки не з'явиться вільний токен.
+        """
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+        logging.warning(f"NBU обмежує запити, швидкість знижено до {self.rate:.2f} запит/с")
+
+
+class CircuitBreaker:
+    """
+    Запобіжник: після `failure_threshold` помилок поспіль перестає пропускати
+    запити на `reset_timeout` секунд, потім пропускає один пробний.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probe_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logging.error(f"Запобіжник NBU розімкнено після {self._failures} помилок поспіль")
+                self._opened_at = time.monotonic()
+
+
+class RateLimitedSession:
+    """
+    HTTP-клієнт для NBU: спільний обмежувач частоти, повтори з експоненційною
+    затримкою та jitter, запобіжник і відповіді з кешу, коли сервер недоступний.
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 20.0,
+        timeout: float = 10.0,
+        cache_size: int = 4096,
+        http: Optional[requests.Session] = None
+    ) -> None:
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._session = http or requests.Session()
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(self.backoff_cap, float(retry_after))
+        # "Full jitter": випадкова затримка в межах експоненційного вікна
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def get(self, url: str) -> requests.Response:
+        """
+        Виконати GET з повторами. Повертає успішну відповідь або піднімає
+        останню помилку; CircuitOpenError, якщо запобіжник розімкнено.
+        """
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"NBU тимчасово недоступний, запит пропущено: {url}")
+
+            self.bucket.acquire()
+            retry_after = None
+            resolved = False
+            try:
+                try:
+                    response = self._session.get(url, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    last_error = e
+                    self.breaker.record_failure()
+                    resolved = True
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        # Сервер відповів, тож він доступний — навіть якщо це 4xx
+                        self.breaker.record_success()
+                        resolved = True
+                        response.raise_for_status()
+                        self.bucket.on_success()
+                        return response
+
+                    last_error = requests.HTTPError(f"HTTP {response.status_code} для {url}", response=response)
+                    retry_after = response.headers.get("Retry-After")
+                    if response.status_code == 429:
+                        self.bucket.on_throttled()
+                    self.breaker.record_failure()
+                    resolved = True
+            finally:
+                # Будь-який інший результат теж завершує пробний запит запобіжника,
+                # інакше він лишився б розімкненим назавжди
+                if not resolved:
+                    self.breaker.record_failure()
+
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, retry_after))
+
+        raise last_error
+
+    def get_json(self, url: str) -> Any:
+        """
+        Отримати JSON за адресою. Якщо сервер недоступний, повертається
+        остання успішна відповідь для цієї адреси (якщо вона є).
+        """
+        try:
+            data = self.get(url).json()
+        except (CircuitOpenError, requests.RequestException) as e:
+            with self._cache_lock:
+                if url in self._cache:
+                    logging.warning(f"Використано кешовані дані NBU: {e}")
+                    return self._cache[url]
+            raise
+
+        with self._cache_lock:
+            self._cache[url] = data
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+
+# Один обмежувач на весь застосунок, щоб паралельні запити ділили ліміт
+nbu_session = RateLimitedSession()
@@ -0,0 +1,199 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+CODE, RATE, CHANGE, SPARKLINE = range(4)
+SPARKLINE_DAYS = 30
+HEADERS = ("Валюта", "Курс", "Зміна, %", f"{SPARKLINE_DAYS} днів")
+
+SORT_ROLE = QtCore.Qt.UserRole
+SPARKLINE_ROLE = QtCore.Qt.UserRole + 1
+
+
+class RatesTableModel(QtCore.QAbstractTableModel):
+    """
+    Таблиця курсів усіх валют: код, курс, денна зміна та спарклайн.
+    Дані приходять знімками; після кожного знімка сповіщаються лише
+    змінені рядки, згруповані в суцільні діапазони dataChanged.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.codes: List[str] = []
+        self.rates: Dict[str, float] = {}
+        self.previous: Dict[str, float] = {}
+        self.sparklines: Dict[str, List[float]] = {}
+        self.day: Optional[date] = None  # дата останнього знімка
+        self._rows: Dict[str, int] = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.codes)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def change(self, code: str) -> Optional[float]:
+        rate, previous = self.rates.get(code), self.previous.get(code)
+        if rate is None or not previous:
+            return None
+        return (rate - previous) / previous * 100
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        code = self.codes[index.row()]
+        column = index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == CODE:
+                return code
+            if column == RATE and code in self.rates:
+                return f"{self.rates[code]:.4f}"
+            if column == CHANGE:
+                change = self.change(code)
+                return None if change is None else f"{change:+.2f}"
+        elif role == SORT_ROLE:
+            if column == CODE:
+                return code
+            if column == RATE:
+                return self.rates.get(code, float("-inf"))
+            if column == CHANGE:
+                change = self.change(code)
+                return float("-inf") if change is None else change
+            return None
+        elif role == SPARKLINE_ROLE and column == SPARKLINE:
+            return self.sparklines.get(code)
+        elif role == QtCore.Qt.ForegroundRole and column == CHANGE:
+            change = self.change(code)
+            if change:
+                return QtGui.QBrush(QtGui.QColor("#2e9d4f" if change > 0 else "#d8452d"))
+        elif role == QtCore.Qt.TextAlignmentRole and column in (RATE, CHANGE):
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def code_at(self, row: int) -> str:
+        return self.codes[row]
+
+    def update_snapshot(
+        self,
+        rates: Dict[str, float],
+        previous: Optional[Dict[str, float]] = None,
+        sparklines: Optional[Dict[str, List[float]]] = None,
+        day: Optional[date] = None
+    ) -> None:
+        """
+        Застосувати новий знімок курсів. Нові валюти додаються одним
+        beginInsertRows, а для змінених рядків надсилаються діапазони dataChanged.
+
+        Без `previous` і `sparklines` вони ведуться за датою знімка `day`: знімок
+        на новий день робить поточні курси попередніми і додає точку в спарклайни.
+        """
+        if previous is None and sparklines is None and day is not None and self.day is not None:
+            previous, sparklines = self._advance(rates, day)
+        if day is not None and (self.day is None or day > self.day):
+            self.day = day
+
+        new_codes = sorted(code for code in rates if code not in self._rows)
+        changed_rows = [
+            self._rows[code] for code, rate in rates.items()
+            if code in self._rows and (
+                self.rates.get(code) != rate
+                or (previous is not None and self.previous.get(code) != previous.get(code))
+                or (sparklines is not None and self.sparklines.get(code) != sparklines.get(code))
+            )
+        ]
+
+        self.rates.update(rates)
+        if previous is not None:
+            self.previous.update(previous)
+        if sparklines is not None:
+            self.sparklines.update(sparklines)
+
+        if new_codes:
+            start = len(self.codes)
+            self.beginInsertRows(QtCore.QModelIndex(), start, start + len(new_codes) - 1)
+            for code in new_codes:
+                self._rows[code] = len(self.codes)
+                self.codes.append(code)
+            self.endInsertRows()
+
+        for first, last in self._ranges(sorted(changed_rows)):
+            self.dataChanged.emit(self.index(first, RATE), self.index(last, SPARKLINE))
+
+    def _advance(self, rates: Dict[str, float], day: date) -> Tuple[Dict[str, float], Dict[str, List[float]]]:
+        previous: Dict[str, float] = {}
+        sparklines: Dict[str, List[float]] = {}
+        if day < self.day:
+            return previous, sparklines  # запізнілий знімок не зсуває історію
+        for code, rate in rates.items():
+            points = self.sparklines.get(code, [])
+            if day > self.day:
+                if code in self.rates:
+                    previous[code] = self.rates[code]
+                sparklines[code] = (points + [rate])[-(SPARKLINE_DAYS + 1):]
+            elif points:
+                # Той самий день: остання точка спарклайна — поточний курс
+                sparklines[code] = points[:-1] + [rate]
+        return previous, sparklines
+
+    @staticmethod
+    def _ranges(rows: List[int]):
+        # [1, 2, 3, 7, 8] -> (1, 3), (7, 8)
+        start = prev = None
+        for row in rows:
+            if start is None:
+                start = prev = row
+            elif row == prev + 1:
+                prev = row
+            else:
+                yield start, prev
+                start = prev = row
+        if start is not None:
+            yield start, prev
+
+
+class RatesFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """
+    Сортування за числовими значеннями та фільтр за кодом валюти.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterKeyColumn(CODE)
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """
+    Малює спарклайн курсу за останні дні прямо в комірці таблиці.
+    """
+
+    def paint(self, painter, option, index) -> None:
+        values = index.data(SPARKLINE_ROLE)
+        if not values or len(values) < 2:
+            super().paint(painter, option, index)
+            return
+
+        rect = option.rect.adjusted(3, 4, -3, -4)
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        step = rect.width() / (len(values) - 1)
+        points = [
+            QtCore.QPointF(rect.left() + i * step, rect.bottom() - (value - low) / span * rect.height())
+            for i, value in enumerate(values)
+        ]
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        color = "#2e9d4f" if values[-1] >= values[0] else "#d8452d"
+        painter.setPen(QtGui.QPen(QtGui.QColor(color), 1.2))
+        painter.drawPolyline(QtGui.QPolygonF(points))
+        painter.restore()
@@ -1,8 +1,28 @@
+import os
 import numpy as np
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
-from typing import List, Optional
+from typing import Optional, Sequence, Union
+
+# Від цієї кількості вибірок бутстреп ділиться між ядрами
+PARALLEL_BOOTSTRAP_MIN = 5000
+
+
+# Список дат або масив днів-ординалів (як повертає RateArchive.get_arrays)
+Dates = Union[Sequence[date], np.ndarray]
+
+
+def _day_offsets(dates: Dates) -> np.ndarray:
+    if isinstance(dates, np.ndarray):
+        return (dates - dates[0]).astype(np.float64)
+    return np.array([(d - dates[0]).days for d in dates], dtype=np.float64)
+
+
+def _last_date(dates: Dates) -> date:
+    return date.fromordinal(int(dates[-1])) if isinstance(dates, np.ndarray) else dates[-1]
+
 
 class RatePredictor:
     """
@@ -11,12 +31,12 @@ class RatePredictor:
     """
 
     @staticmethod
-    def predict_rate(dates: List[date], rates: List[float], degree: int = 2) -> Optional[float]:
+    def predict_rate(dates: Dates, rates: Sequence[float], degree: int = 2) -> Optional[float]:
         if len(dates) < 2 or len(rates) < 2:
             return None
 
         # Перетворюємо дати в числові дні з початку періоду
-        X = np.array([(d - dates[0]).days for d in dates]).reshape(-1, 1)
+        X = _day_offsets(dates).reshape(-1, 1)
         y = np.array(rates)
 
         # Створюємо поліноміальні ознаки
@@ -32,3 +52,69 @@ class RatePredictor:
         prediction = model.predict(next_day_poly)[0]
 
         return round(float(prediction), 4)
+
+    @staticmethod
+    def predict_interval(
+        dates: Dates,
+        rates: Sequence[float],
+        degree: int = 2,
+        horizon: int = 1,
+        n_boot: int = 1000,
+        alpha: float = 0.05,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Прогноз на `horizon` днів вперед з інтервалом (residual bootstrap).
+
+        Модель та сама — поліноміальна регресія. Залишки перевибираються
+        з поверненням, усі вибірки перераховуються одним матричним множенням,
+        а великі кількості вибірок діляться на частини між ядрами.
+
+        :param dates: список дат або масив днів-ординалів з RateArchive.get_arrays
+        :return: словник dates, prediction, lower, upper (списки довжиною horizon) або None
+        """
+        n = len(rates)
+        if len(dates) < 2 or n < degree + 2:
+            return None
+
+        x = _day_offsets(dates)
+        y = np.asarray(rates, dtype=np.float64)
+        future_x = x[-1] + np.arange(1, horizon + 1)
+
+        # Нормуємо час до [0, 1], щоб матриця Вандермонда була добре обумовленою
+        scale = max(x[-1], 1.0)
+        design = np.vander(x / scale, degree + 1)
+        future_design = np.vander(future_x / scale, degree + 1)
+
+        pinv = np.linalg.pinv(design)
+        beta = pinv @ y
+        fitted = design @ beta
+        residuals = (y - fitted) * np.sqrt(n / (n - degree - 1))
+        prediction = future_design @ beta
+
+        def resample(count: int, rng: np.random.Generator) -> np.ndarray:
+            # count × n псевдовибірок курсу -> count наборів коефіцієнтів -> прогнози
+            samples = fitted + residuals[rng.integers(0, n, size=(count, n))]
+            boot_beta = samples @ pinv.T
+            noise = residuals[rng.integers(0, n, size=(count, horizon))]
+            return boot_beta @ future_design.T + noise
+
+        workers = workers or os.cpu_count() or 1
+        seeds = np.random.SeedSequence(seed)
+        if n_boot < PARALLEL_BOOTSTRAP_MIN or workers == 1:
+            forecasts = resample(n_boot, np.random.default_rng(seeds))
+        else:
+            chunks = np.array_split(np.arange(n_boot), workers)
+            rngs = [np.random.default_rng(s) for s in seeds.spawn(len(chunks))]
+            # NumPy відпускає GIL у матричних операціях, тож потоків достатньо
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                forecasts = np.vstack(list(pool.map(resample, [len(c) for c in chunks], rngs)))
+
+        lower, upper = np.quantile(forecasts, [alpha / 2, 1 - alpha / 2], axis=0)
+        return {
+            "dates": [_last_date(dates) + timedelta(days=int(step)) for step in future_x - x[-1]],
+            "prediction": [round(float(v), 4) for v in prediction],
+            "lower": [round(float(v), 4) for v in lower],
+            "upper": [round(float(v), 4) for v in upper]
+        }
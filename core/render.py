@@ -0,0 +1,166 @@
+import argparse
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import matplotlib
+from matplotlib import image as mpimg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from core.graphic import NBUExchangeRates, draw_rates
+from core.logs import log_timing
+
+
+# Спільний пул на весь час роботи застосунку: запуск spawn-процесів коштує
+# сотні мілісекунд на кожен, тож пул не створюється заново на кожне вікно мініатюр
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+    # Воркери рендерять без GUI: лише растровий бекенд Agg
+    matplotlib.use("Agg")
+
+
+def render_png(job: dict) -> Tuple[str, bytes]:
+    """
+    Відрендерити один графік у PNG без Qt.
+
+    :param job: словник з ключами currency, dates, rates, chart_settings
+                і необов'язковими bars, size (дюйми), dpi
+    :return: (код валюти, PNG у байтах)
+    """
+    figure = Figure(figsize=job.get("size", (7, 5)))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    draw_rates(ax, job["dates"], job["rates"], job["chart_settings"], job.get("bars"))
+    ax.set_title(f"Динаміка курсу {job['currency']}")
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=job.get("dpi", 100))
+    return job["currency"], buffer.getvalue()
+
+
+def _new_pool(max_workers: int) -> ProcessPoolExecutor:
+    # spawn, а не fork: батьківський процес може мати потоки Qt
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker)
+
+
+def shared_pool() -> ProcessPoolExecutor:
+    """
+    Пул рендеру застосунку; процеси запускаються за потреби при першому рендері.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(os.cpu_count() or 1)
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Зупинити спільний пул (при виході із застосунку).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def render_many(jobs: List[dict], max_workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Паралельно відрендерити графіки в пулі процесів. Результати
+    повертаються в порядку готовності; якщо споживач перестав їх читати,
+    ще не розпочаті завдання скасовуються.
+
+    :param max_workers: розмір окремого пулу на цей виклик (для CLI);
+                        без нього використовується спільний пул застосунку
+    """
+    if not jobs:
+        return
+
+    pool = _new_pool(min(max_workers, len(jobs))) if max_workers else shared_pool()
+    futures = [pool.submit(render_png, job) for job in jobs]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        if max_workers:
+            pool.shutdown()
+
+
+def load_jobs(currencies: List[str], days: int, chart_settings: dict, **options) -> List[dict]:
+    """
+    Завантажити дані (з локального сховища або NBU) і підготувати завдання рендеру.
+    """
+    jobs = []
+    for currency in currencies:
+        dates, rates = NBUExchangeRates(currency).get_rates(days)
+        if not dates:
+            logging.warning(f"Немає даних для рендеру {currency}")
+            continue
+        jobs.append({"currency": currency, "dates": dates, "rates": rates, "chart_settings": chart_settings, **options})
+    return jobs
+
+
+def render_report(
+    currencies: List[str],
+    days: int,
+    out_path: str,
+    chart_settings: dict,
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Побудувати звіт: PNG-файли в каталозі `out_path` або багатосторінковий
+    PDF, якщо `out_path` закінчується на .pdf.
+
+    :return: список створених файлів
+    """
+    jobs = load_jobs(currencies, days, chart_settings, dpi=150)
+    with log_timing("render_report", charts=len(jobs), days=days):
+        images: Dict[str, bytes] = dict(render_many(jobs, max_workers))
+
+    if out_path.lower().endswith(".pdf"):
+        # Сторінки в порядку запиту, а не в порядку готовності
+        with PdfPages(out_path) as pdf:
+            for job in jobs:
+                page = Figure(dpi=150)
+                FigureCanvasAgg(page)
+                page.figimage(mpimg.imread(io.BytesIO(images[job["currency"]])), resize=True)
+                pdf.savefig(page, dpi=150)
+        return [out_path]
+
+    os.makedirs(out_path, exist_ok=True)
+    paths = []
+    for currency, png in images.items():
+        path = os.path.join(out_path, f"{currency}_{date.today():%Y%m%d}.png")
+        with open(path, "wb") as f:
+            f.write(png)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    from core.settings import DEFAULT_CHART_SETTINGS
+
+    parser = argparse.ArgumentParser(description="Фоновий рендер графіків курсів у PNG або PDF")
+    parser.add_argument("currencies", nargs="+", help="коди валют, наприклад USD EUR")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--out", default="report.pdf", help="файл .pdf або каталог для PNG")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for created in render_report(args.currencies, args.days, args.out, DEFAULT_CHART_SETTINGS, args.workers):
+        print(created)
@@ -0,0 +1,219 @@
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.storage import RateStore, Row
+
+# Частоти агрегування: тиждень, місяць, квартал
+WEEK = "W"
+MONTH = "M"
+QUARTER = "Q"
+FREQUENCIES = (WEEK, MONTH, QUARTER)
+
+
+def bucket_start(day: date, freq: str) -> date:
+    """
+    Перший день періоду (тижня з понеділка, місяця чи кварталу), до якого належить дата.
+    """
+    if freq == WEEK:
+        return day - timedelta(days=day.weekday())
+    if freq == MONTH:
+        return day.replace(day=1)
+    if freq == QUARTER:
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    raise ValueError(f"Невідома частота: {freq}")
+
+
+class BarAggregator:
+    """
+    OHLC/середні бари по тижнях, місяцях і кварталах у таблиці `bars` сховища.
+    Бари оновлюються інкрементно: підписка на нові рядки RateStore зачіпає
+    лише ті періоди, в які ці рядки потрапили, без повного перерахунку.
+    Таблиця `bars_meta` зберігає, скільки рядків сховища враховано: вставки
+    без підписаного агрегатора (імпорт, інший процес) виявляються при запуску.
+    """
+
+    _instance: Optional["BarAggregator"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, store: Optional[RateStore] = None) -> None:
+        self.store = store or RateStore.instance()
+        conn = self.store.connection()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS bars (
+                cc        TEXT NOT NULL,
+                freq      TEXT NOT NULL,
+                bucket    INTEGER NOT NULL,  -- перший день періоду, date.toordinal()
+                first_day INTEGER NOT NULL,
+                last_day  INTEGER NOT NULL,
+                open      REAL NOT NULL,
+                high      REAL NOT NULL,
+                low       REAL NOT NULL,
+                close     REAL NOT NULL,
+                total     REAL NOT NULL,
+                count     INTEGER NOT NULL,
+                PRIMARY KEY (cc, freq, bucket)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS bars_meta (
+                id   INTEGER PRIMARY KEY CHECK (id = 0),
+                rows INTEGER NOT NULL  -- скільки рядків rates враховано в барах
+            );
+            """
+        )
+        # Звірка, перебудова і підписка — під замком запису: вставки з інших потоків
+        # чекають і потрапляють у бари вже через слухача, не губляться і не рахуються двічі
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            covered = conn.execute("SELECT rows FROM bars_meta WHERE id = 0").fetchone()
+            if covered is None or covered[0] != self.store.count():
+                self._rebuild(conn)
+            self.store.add_listener(self.add_rows)
+
+    @classmethod
+    def instance(cls) -> "BarAggregator":
+        # Під замком: перебудова може йти у фоновому потоці, поки воркер уже просить бари
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def rebuild(self) -> None:
+        """
+        Перерахувати всі бари з нуля з таблиці курсів.
+        """
+        conn = self.store.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._rebuild(conn)
+
+    @staticmethod
+    def _rebuild(conn) -> None:
+        # Агрегація в SQLite: у Python лише періоди кожного окремого дня (їх тисячі, а не сотні
+        # тисяч рядків курсів). Тижні й місяці — з курсів, квартали — з уже готових місячних барів;
+        # open/close — курси першого й останнього дня бару
+        conn.execute("DELETE FROM bars")
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS bar_buckets ("
+            "day INTEGER PRIMARY KEY, week INTEGER NOT NULL, month INTEGER NOT NULL, quarter INTEGER NOT NULL)"
+        )
+        conn.execute("DELETE FROM bar_buckets")
+        days = [date.fromordinal(day) for (day,) in conn.execute("SELECT DISTINCT day FROM rates")]
+        conn.executemany(
+            "INSERT INTO bar_buckets (day, week, month, quarter) VALUES (?, ?, ?, ?)",
+            [(day.toordinal(), *(bucket_start(day, freq).toordinal() for freq in FREQUENCIES)) for day in days],
+        )
+        daily = ("SELECT r.cc, b.{} AS bucket, r.day AS first_day, r.day AS last_day,"
+                 " r.rate AS high, r.rate AS low, r.rate AS total, 1 AS count"
+                 " FROM rates r JOIN bar_buckets b ON b.day = r.day")
+        sources = {
+            WEEK: daily.format("week"),
+            MONTH: daily.format("month"),
+            QUARTER: ("SELECT m.cc, b.quarter AS bucket, m.first_day, m.last_day, m.high, m.low, m.total, m.count"
+                      f" FROM bars m JOIN bar_buckets b ON b.day = m.first_day WHERE m.freq = '{MONTH}'"),
+        }
+        for freq in FREQUENCIES:
+            conn.execute(
+                f"""
+                INSERT INTO bars (cc, freq, bucket, first_day, last_day, open, high, low, close, total, count)
+                SELECT g.cc, ?, g.bucket, g.first_day, g.last_day, o.rate, g.high, g.low, c.rate, g.total, g.count
+                FROM (
+                    SELECT s.cc, s.bucket, MIN(s.first_day) AS first_day, MAX(s.last_day) AS last_day,
+                           MAX(s.high) AS high, MIN(s.low) AS low, SUM(s.total) AS total, SUM(s.count) AS count
+                    FROM ({sources[freq]}) s
+                    GROUP BY s.cc, s.bucket
+                ) g
+                JOIN rates o ON o.cc = g.cc AND o.day = g.first_day
+                JOIN rates c ON c.cc = g.cc AND c.day = g.last_day
+                """,
+                (freq,),
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO bars_meta (id, rows) VALUES (0, (SELECT COUNT(*) FROM rates))"
+        )
+
+    def add_rows(self, rows: Iterable[Row]) -> None:
+        """
+        Врахувати нові денні курси в барах усіх частот.
+        """
+        # (cc, freq, bucket) -> [first_day, last_day, open, high, low, close, total, count]
+        updates: Dict[Tuple[str, str, int], list] = {}
+        count = 0
+        for cc, day, rate in rows:
+            count += 1
+            ordinal = day.toordinal()
+            for freq in FREQUENCIES:
+                key = (cc, freq, bucket_start(day, freq).toordinal())
+                bar = updates.get(key)
+                if bar is None:
+                    updates[key] = [ordinal, ordinal, rate, rate, rate, rate, rate, 1]
+                else:
+                    self._merge(bar, [ordinal, ordinal, rate, rate, rate, rate, rate, 1])
+        if not updates:
+            return
+
+        conn = self.store.connection()
+        with conn:
+            for key, bar in updates.items():
+                existing = conn.execute(
+                    "SELECT first_day, last_day, open, high, low, close, total, count "
+                    "FROM bars WHERE cc = ? AND freq = ? AND bucket = ?", key
+                ).fetchone()
+                if existing:
+                    merged = list(existing)
+                    self._merge(merged, bar)
+                    bar = merged
+                conn.execute(
+                    "INSERT OR REPLACE INTO bars "
+                    "(cc, freq, bucket, first_day, last_day, open, high, low, close, total, count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (*key, *bar)
+                )
+            conn.execute("UPDATE bars_meta SET rows = rows + ? WHERE id = 0", (count,))
+
+    @staticmethod
+    def _merge(bar: list, other: list) -> None:
+        # Дані можуть надходити не по порядку: open/close беруться за крайніми датами
+        if other[0] < bar[0]:
+            bar[0], bar[2] = other[0], other[2]
+        if other[1] > bar[1]:
+            bar[1], bar[5] = other[1], other[5]
+        bar[3] = max(bar[3], other[3])
+        bar[4] = min(bar[4], other[4])
+        bar[6] += other[6]
+        bar[7] += other[7]
+
+    def get_bars(self, currency_code: str, freq: str, start_date: date, end_date: date) -> dict:
+        """
+        Бари валюти за період.
+
+        :return: словник списків: dates (початок періоду), open, high, low, close, mean
+        """
+        cursor = self.store.connection().execute(
+            "SELECT bucket, open, high, low, close, total, count FROM bars "
+            "WHERE cc = ? AND freq = ? AND bucket BETWEEN ? AND ? ORDER BY bucket",
+            (currency_code, freq, bucket_start(start_date, freq).toordinal(), end_date.toordinal())
+        )
+        bars = {"dates": [], "open": [], "high": [], "low": [], "close": [], "mean": []}
+        for bucket, open_, high, low, close, total, count in cursor:
+            bars["dates"].append(date.fromordinal(bucket))
+            bars["open"].append(open_)
+            bars["high"].append(high)
+            bars["low"].append(low)
+            bars["close"].append(close)
+            bars["mean"].append(total / count)
+        return bars
+
+
+def daily_bars(dates: List[date], rates: List[float]) -> dict:
+    """
+    Денні «бари» з ряду одного курсу: open — попереднє закриття.
+    """
+    opens = rates[:1] + rates[:-1]
+    return {
+        "dates": list(dates),
+        "open": opens,
+        "high": [max(o, c) for o, c in zip(opens, rates)],
+        "low": [min(o, c) for o, c in zip(opens, rates)],
+        "close": list(rates),
+        "mean": list(rates)
+    }
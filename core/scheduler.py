@@ -0,0 +1,117 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from PyQt5 import QtCore
+
+from core.scrap import ExchangeRateAPIClient
+from core.settings import SettingsService
+from core.workers import SnapshotWorker
+
+DEFAULT_INTERVAL_MIN = 15
+# NBU встановлює офіційний курс на наступний день близько 15:30 за Києвом
+DEFAULT_PUBLICATION_TIME = "15:45"
+
+
+class RefreshScheduler(QtCore.QObject):
+    """
+    Фонове оновлення курсів усього ринку за інтервалом. Кожен тік — один запит
+    знімка всіх валют (NBU віддає їх однією відповіддю, тож фільтр за списком
+    не економить запитів); якщо попередній тік ще виконується, новий
+    пропускається, а не ставиться в чергу.
+    Одразу після публікації NBU окремо запитуються курси на наступний день.
+    """
+
+    snapshot_ready = QtCore.pyqtSignal(object, dict)  # дата знімка, усі його курси
+    rates_changed = QtCore.pyqtSignal(dict)   # лише змінені курси
+    published = QtCore.pyqtSignal(object, dict)  # дата, опубліковані NBU курси на неї
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, scrapper: ExchangeRateAPIClient, settings: Optional[SettingsService] = None, parent=None):
+        super().__init__(parent)
+        self.scrapper = scrapper
+        self.settings = settings or SettingsService.instance()
+        self.worker: Optional[SnapshotWorker] = None
+        # Окремий воркер: запит опублікованих курсів не пропускається через звичайний тік
+        self.publication_worker: Optional[SnapshotWorker] = None
+        self.last_rates: Dict[str, float] = {}
+
+        self._interval_timer = QtCore.QTimer(self)
+        self._interval_timer.timeout.connect(self.tick)
+
+        self._publication_timer = QtCore.QTimer(self)
+        self._publication_timer.setSingleShot(True)
+        self._publication_timer.timeout.connect(self._on_publication)
+
+        self.settings.changed.connect(self._on_setting_changed)
+
+    def start(self) -> None:
+        interval_min = self.settings.get("refresh_interval_min", DEFAULT_INTERVAL_MIN)
+        if interval_min and interval_min > 0:
+            self._interval_timer.start(int(interval_min * 60 * 1000))
+        else:
+            self._interval_timer.stop()
+        self._arm_publication_timer()
+
+    def stop(self) -> None:
+        self._interval_timer.stop()
+        self._publication_timer.stop()
+
+    def _arm_publication_timer(self) -> None:
+        publication_time = self.settings.get("refresh_publication_time", DEFAULT_PUBLICATION_TIME)
+        if not publication_time:
+            self._publication_timer.stop()
+            return
+
+        try:
+            hour, minute = (int(part) for part in publication_time.split(":"))
+        except ValueError:
+            logging.warning(f"Некоректний час публікації курсів: {publication_time}")
+            return
+
+        now = datetime.now()
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        self._publication_timer.start(int((target - now).total_seconds() * 1000))
+
+    def _on_publication(self) -> None:
+        self._arm_publication_timer()
+        if self.publication_worker and self.publication_worker.isRunning():
+            return
+        # Опубліковані курси діють з наступного дня: знімок без дати повернув би сьогоднішні.
+        # Вони зберігаються в сховище, але не підміняють поточні курси в таблиці
+        self.publication_worker = SnapshotWorker(None, scrapper=self.scrapper, day=date.today() + timedelta(days=1))
+        self.publication_worker.finished.connect(self._on_published)
+        self.publication_worker.error.connect(self.error)
+        self.publication_worker.start()
+
+    def _on_published(self, day: date, rates: dict) -> None:
+        # Порожня відповідь — курси на завтра ще не опубліковані
+        if rates:
+            self.published.emit(day, rates)
+
+    def _on_setting_changed(self, key: str, value) -> None:
+        if key in ("refresh_interval_min", "refresh_publication_time"):
+            self.start()
+
+    def tick(self) -> None:
+        if self.worker and self.worker.isRunning():
+            logging.debug("Попереднє оновлення курсів ще виконується, тік пропущено")
+            return
+
+        self.worker = SnapshotWorker(None, scrapper=self.scrapper)
+        self.worker.finished.connect(self.apply_snapshot)
+        self.worker.error.connect(self.error)
+        self.worker.start()
+
+    def apply_snapshot(self, day: date, rates: dict) -> None:
+        """
+        Прийняти знімок курсів на дату `day` (власний або отриманий іншим запитом)
+        і розіслати сигнали для всіх його валют: таблиця показує весь ринок.
+        """
+        changed = {code: rate for code, rate in rates.items() if self.last_rates.get(code) != rate}
+        self.last_rates.update(rates)
+        self.snapshot_ready.emit(day, rates)
+        if changed:
+            self.rates_changed.emit(changed)
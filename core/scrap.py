@@ -1,12 +1,14 @@
-import requests
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
+
+from core.ratelimit import RateLimitedSession, nbu_session
 
 
 class ExchangeRateAPIClient:
     BASE_URL = "https://bank.gov.ua/NBUStatService/v1/statdirectory"
 
-    def __init__(self):
-        pass
+    def __init__(self, session: Optional[RateLimitedSession] = None):
+        self.session = session or nbu_session
 
     def get_symbols(self) -> dict:
         """
@@ -14,9 +16,7 @@ class ExchangeRateAPIClient:
         :return: словарь вида {"symbols": {код: код, ...}}
         """
         url = f"{self.BASE_URL}/exchange?json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = self.session.get_json(url)
 
         symbols = {item['cc']: item['cc'] for item in data if item['cc'] != "UAH"}
         return {"symbols": symbols}
@@ -28,9 +28,7 @@ class ExchangeRateAPIClient:
         :return: словарь с курсом
         """
         url = f"{self.BASE_URL}/exchange?valcode={base_currency}&json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = self.session.get_json(url)
 
         if not data:
             raise ValueError(f"Курс {base_currency} не найден.")
@@ -43,24 +41,31 @@ class ExchangeRateAPIClient:
             "date": rate_info["exchangedate"]
         }
 
-    def get_current_rates(self, symbols: list) -> dict:
+    def get_snapshot(self, day: Optional[date] = None) -> dict:
         """
-        Получить текущие курсы нескольких валют к гривне.
-        :param symbols: список валют, например ["USD", "EUR"]
-        :return: словарь вида {код: курс}
+        Получить курсы всех валют к гривне одним запросом.
+        :param day: дата курсов (по умолчанию текущая)
+        :return: словарь вида {"date": дата курсов, "rates": {код: курс}}
         """
         url = f"{self.BASE_URL}/exchange?json"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        if day is not None:
+            url = f"{self.BASE_URL}/exchange?date={day.strftime('%Y%m%d')}&json"
+        data = self.session.get_json(url)
 
-        result = {}
-        for item in data:
-            code = item['cc']
-            if code in symbols:
-                result[code] = item['rate']
+        rates = {item['cc']: item['rate'] for item in data if item['cc'] != "UAH"}
+        exchange_date = datetime.strptime(data[0]["exchangedate"], "%d.%m.%Y").date() if data else day
+        return {"date": exchange_date, "rates": rates}
 
-        return result
+    def get_current_rates(self, symbols: Optional[list] = None) -> dict:
+        """
+        Получить текущие курсы нескольких валют к гривне.
+        :param symbols: список валют, например ["USD", "EUR"]; None — все валюты
+        :return: словарь вида {код: курс}
+        """
+        rates = self.get_snapshot()["rates"]
+        if symbols is None:
+            return rates
+        return {code: rate for code, rate in rates.items() if code in symbols}
 
 
 # Пример использования
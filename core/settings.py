@@ -1,42 +1,108 @@
+import copy
+import logging
+from typing import Any, Optional
+
+from PyQt5 import QtCore
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout,
     QRadioButton, QPushButton, QCheckBox,
-    QComboBox, QLabel, QColorDialog
+    QComboBox, QLabel, QColorDialog, QLineEdit, QSpinBox
 )
 from core.сonfig import load_config, save_config
 
+DEFAULT_CHART_SETTINGS = {
+    "chart_type": "Лінійний",
+    "show_grid": True,
+    "show_sma": False,
+    "line_color": "#2d78d8"  # Цвет по умолчанию
+}
+DEFAULT_THUMBNAIL_CURRENCIES = ["USD", "EUR"]
+
+
+class SettingsService(QtCore.QObject):
+    """
+    Спільне для всього застосунку сховище налаштувань у пам'яті.
+    Зміни одразу доступні читачам, а на диск пишуться відкладено:
+    кілька змін поспіль об'єднуються в один атомарний запис config.json.
+    """
+
+    changed = QtCore.pyqtSignal(str, object)  # ключ, нове значення
+    theme_changed = QtCore.pyqtSignal(bool)
+    chart_settings_changed = QtCore.pyqtSignal(dict)
+
+    SAVE_DELAY_MS = 500
 
-class SettingsService:
-    def __init__(self):
+    _instance: Optional["SettingsService"] = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.config = load_config()
+        # Колишній «watchlist» тепер задає лише валюти мініатюр: планувальник оновлює весь ринок
+        if "watchlist" in self.config:
+            self.config.setdefault("thumbnail_currencies", self.config.pop("watchlist"))
 
         self.is_dark_theme = self.config.get("is_dark_theme", False)
-        self.chart_settings = self.config.get(
-            "chart_settings",
-            {
-                "chart_type": "Лінійний",
-                "show_grid": True,
-                "show_sma": False,
-                "line_color": "#2d78d8"  # Цвет по умолчанию
-            }
-        )
+        self.chart_settings = self.config.get("chart_settings", dict(DEFAULT_CHART_SETTINGS))
+
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+
+    @classmethod
+    def instance(cls) -> "SettingsService":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.config.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        if self.config.get(key) == value:
+            return
+        self.config[key] = value
+        self._schedule_save()
+        self.changed.emit(key, value)
+
+    @property
+    def thumbnail_currencies(self) -> list:
+        return list(self.config.get("thumbnail_currencies", DEFAULT_THUMBNAIL_CURRENCIES))
 
     def load_theme(self) -> bool:
         return self.is_dark_theme
 
     def save_theme(self, is_dark: bool) -> None:
+        if self.is_dark_theme == is_dark and "is_dark_theme" in self.config:
+            return
         self.is_dark_theme = is_dark
-        self.config["is_dark_theme"] = is_dark
-        save_config(self.config)
+        self.set("is_dark_theme", is_dark)
+        self.theme_changed.emit(is_dark)
 
     def load_chart_settings(self) -> dict:
         return self.chart_settings
 
     def save_chart_settings(self, chart_settings: dict) -> None:
-        self.chart_settings = chart_settings
-        self.config["chart_settings"] = chart_settings
-        save_config(self.config)
+        if self.chart_settings == chart_settings and "chart_settings" in self.config:
+            return
+        self.chart_settings = copy.deepcopy(chart_settings)
+        self.set("chart_settings", self.chart_settings)
+        self.chart_settings_changed.emit(self.chart_settings)
+
+    def _schedule_save(self) -> None:
+        # Кожна нова зміна відкладає запис, тож серія змін дає один запис
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        """
+        Негайно записати незбережені зміни (наприклад, перед виходом).
+        """
+        self._save_timer.stop()
+        try:
+            save_config(self.config)
+        except OSError as e:
+            logging.error(f"Не вдалося зберегти налаштування: {e}")
 
 
 class ThemeSettingsDialog(QDialog):
@@ -44,11 +110,12 @@ class ThemeSettingsDialog(QDialog):
         super().__init__(parent)
 
         self.setWindowTitle("Налаштування")
-        self.setFixedSize(360, 400)
+        self.setFixedSize(360, 560)
 
-        self.settings_service = settings_service or SettingsService()
+        self.settings_service = settings_service or SettingsService.instance()
         self.is_dark_theme = self.settings_service.load_theme()
-        self.chart_settings = self.settings_service.load_chart_settings()
+        # Копія, щоб вибір кольору не змінював спільні налаштування до натискання OK
+        self.chart_settings = dict(self.settings_service.load_chart_settings())
 
         self.init_ui()
 
@@ -89,7 +156,7 @@ class ThemeSettingsDialog(QDialog):
         layout.addWidget(QLabel("Тип графіка:"))
 
         self.chart_type_combo = QComboBox()
-        self.chart_type_combo.addItems(["Лінійний", "Баровий", "Точечний", "Діаграмма розбросу"])
+        self.chart_type_combo.addItems(["Лінійний", "Баровий", "Точечний", "Діаграмма розбросу", "Свічковий"])
         self.chart_type_combo.setCurrentText(self.chart_settings.get("chart_type", "Лінійний"))
         layout.addWidget(self.chart_type_combo)
 
@@ -101,6 +168,28 @@ class ThemeSettingsDialog(QDialog):
         self.checkbox_sma.setChecked(self.chart_settings.get("show_sma", False))
         layout.addWidget(self.checkbox_sma)
 
+        # --- Мініатюри ---
+        layout.addSpacing(10)
+        layout.addWidget(QLabel("Валюти для мініатюр (через кому):"))
+
+        self.thumbnails_edit = QLineEdit(", ".join(self.settings_service.thumbnail_currencies))
+        layout.addWidget(self.thumbnails_edit)
+
+        # --- Автооновлення ---
+        interval_layout = QHBoxLayout()
+        interval_layout.addWidget(QLabel("Автооновлення курсів, хв (0 — вимк.):"))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(0, 24 * 60)
+        self.interval_spin.setValue(self.settings_service.get("refresh_interval_min", 15))
+        interval_layout.addWidget(self.interval_spin)
+        layout.addLayout(interval_layout)
+
+        # --- Діагностика ---
+        layout.addSpacing(10)
+        self.checkbox_profiling = QCheckBox("Профілювання (logs/profiles)")
+        self.checkbox_profiling.setChecked(self.settings_service.get("profiling", False))
+        layout.addWidget(self.checkbox_profiling)
+
         # --- Кнопки ---
         btn_layout = QHBoxLayout()
         btn_ok = QPushButton("OK")
@@ -130,6 +219,9 @@ class ThemeSettingsDialog(QDialog):
         if self.exec() == QDialog.Accepted:
             self.settings_service.save_theme(self.selected_theme() == "dark")
             self.settings_service.save_chart_settings(self.selected_chart_settings())
+            self.settings_service.set("thumbnail_currencies", self.selected_thumbnail_currencies())
+            self.settings_service.set("refresh_interval_min", self.interval_spin.value())
+            self.settings_service.set("profiling", self.checkbox_profiling.isChecked())
             return True
         return False
 
@@ -146,6 +238,10 @@ class ThemeSettingsDialog(QDialog):
             self.chart_settings["line_color"] = hex_color
             self.color_label.setStyleSheet(f"background-color: {hex_color}")
 
+    def selected_thumbnail_currencies(self) -> list:
+        codes = (code.strip().upper() for code in self.thumbnails_edit.text().split(","))
+        return [code for code in dict.fromkeys(codes) if code]
+
     def selected_chart_settings(self) -> dict:
         return {
             "chart_type": self.chart_type_combo.currentText(),
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "cfgs", "rates.sqlite3")
+
+Row = Tuple[str, date, float]
+
+
+class RateStore:
+    """
+    Локальне сховище історичних курсів (SQLite): одна таблиця
+    (валюта, дата, курс) з первинним ключем по валюті та даті.
+    """
+
+    _instance: Optional["RateStore"] = None
+
+    def __init__(self, path: str = DB_PATH) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._listeners: List[Callable[[List[Row]], None]] = []
+        # Зростає з кожною вставкою; дозволяє кешувати похідні розрахунки
+        self.version = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS rates (
+                cc   TEXT NOT NULL,
+                day  INTEGER NOT NULL,  -- date.toordinal()
+                rate REAL NOT NULL,
+                PRIMARY KEY (cc, day)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS rates_day ON rates (day);
+            """
+        )
+
+    @classmethod
+    def instance(cls) -> "RateStore":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def connection(self) -> sqlite3.Connection:
+        # SQLite-з'єднання не можна ділити між потоками, тому своє на кожен потік
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add_listener(self, callback: Callable[[List[Row]], None]) -> None:
+        """
+        Підписатися на нові рядки: callback отримує список щойно вставлених рядків.
+        """
+        self._listeners.append(callback)
+
+    def insert_many(self, rows: Iterable[Row]) -> int:
+        """
+        Вставити рядки, пропускаючи ті, що вже є в сховищі.
+        Слухачі отримують лише рядки, які справді записала ця вставка,
+        навіть якщо ті самі дні паралельно вставляє інший потік.
+
+        :return: кількість фактично доданих рядків
+        """
+        batch = {(cc, d.toordinal()): rate for cc, d, rate in rows}
+        if not batch:
+            return 0
+
+        conn = self.connection()
+        codes = sorted({cc for cc, _ in batch})
+        days = [day for _, day in batch]
+        with conn:
+            # Перевірка й вставка в одній транзакції запису: паралельна вставка тих самих
+            # днів чекає на замок і вже бачить ці рядки, тож слухачі не отримають їх двічі
+            conn.execute("BEGIN IMMEDIATE")
+            # Лише валюти цієї партії: обсяг перевірки не залежить від решти сховища
+            existing: Set[Tuple[str, int]] = set(conn.execute(
+                f"SELECT cc, day FROM rates WHERE cc IN ({', '.join('?' * len(codes))}) AND day BETWEEN ? AND ?",
+                (*codes, min(days), max(days))
+            ))
+            new_rows = [(cc, day, rate) for (cc, day), rate in batch.items() if (cc, day) not in existing]
+            conn.executemany("INSERT INTO rates (cc, day, rate) VALUES (?, ?, ?)", new_rows)
+        if not new_rows:
+            return 0
+
+        inserted = [(cc, date.fromordinal(day), rate) for cc, day, rate in new_rows]
+        for callback in self._listeners:
+            callback(inserted)
+        # Після слухачів, щоб кеш за версією не побачив ще не оновлені похідні дані
+        self.version += 1
+        return len(inserted)
+
+    def get_series(self, currency_code: str, start_date: date, end_date: date) -> Tuple[List[date], List[float]]:
+        """
+        Курси валюти за період (включно), відсортовані за датою.
+        """
+        cursor = self.connection().execute(
+            "SELECT day, rate FROM rates WHERE cc = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (currency_code, start_date.toordinal(), end_date.toordinal())
+        )
+        dates: List[date] = []
+        rates: List[float] = []
+        for day, rate in cursor:
+            dates.append(date.fromordinal(day))
+            rates.append(rate)
+        return dates, rates
+
+    def get_period(self, start_date: date, end_date: date) -> List[Tuple[str, int, float]]:
+        """
+        Усі курси за період одним запитом: список (валюта, день-ординал, курс).
+        """
+        return self.connection().execute(
+            "SELECT cc, day, rate FROM rates WHERE day BETWEEN ? AND ?",
+            (start_date.toordinal(), end_date.toordinal())
+        ).fetchall()
+
+    def currencies(self) -> List[str]:
+        return [cc for (cc,) in self.connection().execute("SELECT DISTINCT cc FROM rates ORDER BY cc")]
+
+    def count(self) -> int:
+        return self.connection().execute("SELECT COUNT(*) FROM rates").fetchone()[0]
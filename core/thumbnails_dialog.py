@@ -0,0 +1,72 @@
+from typing import Dict, List, Optional
+
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtWidgets import QDialog, QGridLayout, QLabel, QScrollArea, QVBoxLayout, QWidget
+
+from core.workers import ThumbnailWorker, retire_worker
+
+COLUMNS = 3
+
+
+class ThumbnailsDialog(QDialog):
+    """
+    Сітка мініатюр графіків для валют зі списку спостереження.
+    Графіки рендеряться у фоновому пулі процесів і з'являються по мірі готовності.
+    """
+
+    def __init__(self, currencies: List[str], days: int, chart_settings: dict, parent=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("Мініатюри графіків")
+        self.resize(860, 600)
+        self.labels: Dict[str, QLabel] = {}
+        self.worker: Optional[ThumbnailWorker] = None
+
+        self.init_ui(currencies)
+
+        self.worker = ThumbnailWorker(currencies, days, chart_settings)
+        self.worker.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.worker.error.connect(self.status_label.setText)
+        self.worker.finished.connect(lambda: self.status_label.setText("Готово."))
+        self.worker.start()
+
+    def init_ui(self, currencies: List[str]) -> None:
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel("Побудова мініатюр...")
+        layout.addWidget(self.status_label)
+
+        grid_widget = QWidget()
+        grid = QGridLayout(grid_widget)
+        for index, currency in enumerate(currencies):
+            label = QLabel(currency)
+            label.setAlignment(QtCore.Qt.AlignCenter)
+            label.setMinimumSize(256, 192)
+            grid.addWidget(label, index // COLUMNS, index % COLUMNS)
+            self.labels[currency] = label
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(grid_widget)
+        layout.addWidget(scroll)
+
+        self.setLayout(layout)
+
+    def on_thumbnail_ready(self, currency: str, png: bytes) -> None:
+        pixmap = QtGui.QPixmap()
+        pixmap.loadFromData(png, "PNG")
+        label = self.labels.get(currency)
+        if label:
+            label.setPixmap(pixmap)
+
+    def done(self, result: int) -> None:
+        # Викликається і при закритті вікна, і при Esc (на відміну від closeEvent).
+        # Воркер не чекаємо в GUI-потоці: скасовуємо його і відпускаємо до завершення
+        if self.worker and self.worker.isRunning():
+            self.worker.thumbnail_ready.disconnect()
+            self.worker.error.disconnect()
+            self.worker.finished.disconnect()
+            self.worker.cancel()
+            retire_worker(self.worker)
+        self.worker = None
+        super().done(result)
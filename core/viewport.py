@@ -0,0 +1,185 @@
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import matplotlib.dates as mdates
+from PyQt5 import QtCore
+
+from core.archive import ARCHIVE_START as NBU_HISTORY_START
+from core.workers import HistoryWorker, retire_worker
+
+TARGET_POINTS = 365  # приблизна кількість точок на ширину графіка
+DEBOUNCE_MS = 300
+ZOOM_STEP = 1.25
+
+def sample_step(span_days: int, target_points: int = TARGET_POINTS) -> int:
+    """
+    Крок вибірки в днях, щоб на видимий період припадало близько `target_points` точок.
+    """
+    return max(1, math.ceil(span_days / target_points))
+
+
+def grid_dates(start: date, end: date, step: int) -> List[date]:
+    """
+    Дати з кроком `step`, вирівняні за ordinal: при панорамуванні на тому ж
+    масштабі сітка не зсувається і вже завантажені точки не запитуються повторно.
+    """
+    first = start.toordinal()
+    first += -first % step
+    return [date.fromordinal(ordinal) for ordinal in range(first, end.toordinal() + 1, step)]
+
+
+class HistoryViewport(QtCore.QObject):
+    """
+    Інтерактивна вісь часу графіка: колесо миші масштабує, перетягування
+    панорамує. Після зупинки руху (з затримкою DEBOUNCE_MS) довантажуються лише
+    ще не запитані дати видимого діапазону з кроком, що відповідає масштабу,
+    і нові точки вклеюються в наявний ряд.
+    """
+
+    series_changed = QtCore.pyqtSignal()
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, canvas, ax, currency_code: str, dates: List[date], rates: List[float], parent=None) -> None:
+        super().__init__(parent)
+        self.canvas = canvas
+        self.ax = ax
+        self.currency_code = currency_code
+        self.series: Dict[date, float] = dict(zip(dates, rates))
+        # Усі дні початкового періоду вже запитані, включно з днями без курсу
+        self.requested: Set[int] = set(range(dates[0].toordinal(), dates[-1].toordinal() + 1))
+
+        self._worker: Optional[HistoryWorker] = None
+        self._pending = False
+        self._closed = False
+        self._drag: Optional[Tuple[float, Tuple[float, float]]] = None  # піксель x, xlim на початку
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self.load_visible)
+
+        self._cids = [
+            canvas.mpl_connect("scroll_event", self._on_scroll),
+            canvas.mpl_connect("button_press_event", self._on_press),
+            canvas.mpl_connect("motion_notify_event", self._on_motion),
+            canvas.mpl_connect("button_release_event", self._on_release),
+        ]
+        self.attach(ax)
+
+    def attach(self, ax) -> None:
+        """
+        Підписатися на зміну меж осі X. Викликається після кожного ax.clear(),
+        бо очищення осей скидає їхні callbacks.
+        """
+        self.ax = ax
+        ax.callbacks.connect("xlim_changed", lambda _ax: self._timer.start())
+
+    def close(self) -> None:
+        self._closed = True
+        self._timer.stop()
+        if self._worker and self._worker.isRunning():
+            retire_worker(self._worker)
+        self._worker = None
+        for cid in self._cids:
+            self.canvas.mpl_disconnect(cid)
+        self._cids = []
+
+    def series_lists(self) -> Tuple[List[date], List[float]]:
+        dates = sorted(self.series)
+        return dates, [self.series[day] for day in dates]
+
+    def visible_range(self) -> Tuple[date, date]:
+        low, high = self.ax.get_xlim()
+        low = max(low, mdates.date2num(datetime.combine(NBU_HISTORY_START, datetime.min.time())))
+        high = min(high, mdates.date2num(datetime.combine(date.today(), datetime.min.time())))
+        if low > high:
+            return date.today(), NBU_HISTORY_START  # порожній діапазон
+        return mdates.num2date(low).date(), mdates.num2date(high).date()
+
+    def fit_y(self) -> None:
+        """
+        Підлаштувати вісь Y під точки видимого діапазону.
+        """
+        start, end = self.visible_range()
+        visible = [rate for day, rate in self.series.items() if start <= day <= end]
+        if not visible:
+            return
+        low, high = min(visible), max(visible)
+        margin = (high - low) * 0.05 or abs(high) * 0.01 or 1.0
+        self.ax.set_ylim(low - margin, high + margin)
+
+    def load_visible(self) -> None:
+        """
+        Запитати дати видимого діапазону, яких ще немає в ряду.
+        """
+        if self._closed:
+            return
+        if self._worker and self._worker.isRunning():
+            self._pending = True
+            return
+
+        start, end = self.visible_range()
+        if start > end:
+            return
+        step = sample_step((end - start).days)
+        wanted = [day for day in grid_dates(start, end, step) if day.toordinal() not in self.requested]
+        if not wanted:
+            return
+
+        self.requested.update(day.toordinal() for day in wanted)
+        self._worker = HistoryWorker(self.currency_code, wanted)
+        self._worker.finished.connect(self._on_loaded)
+        self._worker.error.connect(self._on_error)
+        self._worker.start()
+
+    def _on_loaded(self, dates: List[date], rates: List[float], failed: List[date]) -> None:
+        if self._closed:
+            return
+        # Знову запитуються лише дати без відповіді сервера; дати, на які NBU
+        # відповів без курсу (до появи валюти, неопубліковані), лишаються запитаними
+        self.requested.difference_update(day.toordinal() for day in failed)
+        if dates:
+            self.series.update(zip(dates, rates))
+            self.series_changed.emit()
+        self._continue()
+
+    def _on_error(self, message: str, wanted: List[date]) -> None:
+        if self._closed:
+            return
+        self.requested.difference_update(day.toordinal() for day in wanted)
+        self.error.emit(message)
+        self._continue()
+
+    def _continue(self) -> None:
+        # Поки йшов запит, користувач міг зрушити графік далі
+        if self._pending:
+            self._pending = False
+            self._timer.start()
+
+    def _on_scroll(self, event) -> None:
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        factor = 1 / ZOOM_STEP if event.button == "up" else ZOOM_STEP
+        low, high = self.ax.get_xlim()
+        x = event.xdata
+        self.ax.set_xlim(x - (x - low) * factor, x + (high - x) * factor)
+        self.canvas.draw_idle()
+
+    def _on_press(self, event) -> None:
+        if event.button == 1 and event.inaxes is self.ax:
+            self._drag = (event.x, self.ax.get_xlim())
+
+    def _on_motion(self, event) -> None:
+        if self._drag is None or event.x is None:
+            return
+        start_x, (low, high) = self._drag
+        shift = (event.x - start_x) * (high - low) / self.ax.bbox.width
+        self.ax.set_xlim(low - shift, high - shift)
+        self.canvas.draw_idle()
+
+    def _on_release(self, event) -> None:
+        if self._drag is not None:
+            self._drag = None
+            self.fit_y()
+            self.canvas.draw_idle()
@@ -2,12 +2,42 @@ from PyQt5 import QtCore
 import logging
 import traceback
 import time
-from typing import List
-from datetime import date
+from typing import List, Optional, Set
+from datetime import date, timedelta
 
 from core.scrap import ExchangeRateAPIClient
 from core.graphic import NBUExchangeRates
 from core.regression import RatePredictor
+from core.logs import log_timing
+from core.profiling import profiled
+from core.analytics import get_analytics
+from core.resample import BarAggregator, daily_bars
+from core.render import load_jobs, render_many
+from core.storage import RateStore
+from core.archive import RateArchive
+
+# Для довших періодів таймаут графіка не діє: на холодному сховищі 3 чи 10 років —
+# це тисячі денних запитів до NBU, які за 30 с не встигнуть навіть з повним лімітом
+LONG_PERIOD_DAYS = 365
+
+# Потоки закритих вікон, що ще виконуються: QThread не можна знищувати до завершення
+_retired_workers: Set[QtCore.QThread] = set()
+
+
+def retire_worker(worker: QtCore.QThread) -> None:
+    """
+    Утримати посилання на воркер, поки він не надішле finished або error.
+    Вікно закривається одразу, без worker.wait() у GUI-потоці.
+    """
+    _retired_workers.add(worker)
+
+    def release(*_args) -> None:
+        worker.wait()
+        _retired_workers.discard(worker)
+
+    worker.finished.connect(release)
+    worker.error.connect(release)
+
 
 def validate_rates(
     dates: List[date],
@@ -56,6 +86,7 @@ class PredictWorker(QtCore.QThread):
         self.currency_code = currency_code
         self.days = days
 
+    @profiled("PredictWorker.run")
     def run(self):
         try:
             nbu = NBUExchangeRates(self.currency_code)
@@ -65,9 +96,13 @@ class PredictWorker(QtCore.QThread):
                 return
 
             predictor = RatePredictor()
-            predicted_rate = predictor.predict_rate(dates, rates)
+            with log_timing("PredictWorker predict", currency=self.currency_code, points=len(rates)):
+                predicted_rate = predictor.predict_rate(dates, rates)
+                forecast = predictor.predict_interval(dates, rates)
 
             result_text = f"Прогноз курсу {self.currency_code} до UAH на наступний день: {predicted_rate:.2f}"
+            if forecast:
+                result_text += f" (95% інтервал: {forecast['lower'][0]:.2f} – {forecast['upper'][0]:.2f})"
             self.finished.emit(result_text)
 
         except Exception as e:
@@ -75,24 +110,49 @@ class PredictWorker(QtCore.QThread):
             self.error.emit(f"Помилка при прогнозуванні: {e}")
 
 class ChartWorker(QtCore.QThread):
-    finished = QtCore.pyqtSignal(object, object, float)  # дати, курси, прогноз
+    finished = QtCore.pyqtSignal(object, object, object, object)  # дати, курси, прогноз з інтервалом, OHLC-бари
     error = QtCore.pyqtSignal(str)
 
-    def __init__(self, currency_code: str, days: int = 30, timeout: int = 30) -> None:
+    def __init__(
+        self,
+        currency_code: str,
+        days: int = 30,
+        timeout: int = 30,
+        resolution: str = "D",
+        forecast_horizon: int = 7
+    ) -> None:
         super().__init__()
         self.currency_code = currency_code
         self.days = days
         self.timeout = timeout
+        self.resolution = resolution
+        self.forecast_horizon = forecast_horizon
         self._start_time = None
 
+    def _period_stored(self, start_date: date, end_date: date) -> bool:
+        """
+        Чи є в сховищі курс на кожен день періоду (тоді бари в ньому повні).
+        """
+        days, _ = RateArchive.instance().get_arrays(self.currency_code, start_date, end_date)
+        return len(days) == (end_date - start_date).days + 1
+
+    @profiled("ChartWorker.run")
     def run(self) -> None:
         self._start_time = time.time()
         try:
+            end_date = date.today()
+            start_date = end_date - timedelta(days=self.days)
+            if self.resolution != "D" and self._period_stored(start_date, end_date):
+                # Бари читаються готовими зі сховища, без денного ряду і запитів до NBU
+                bars = BarAggregator.instance().get_bars(self.currency_code, self.resolution, start_date, end_date)
+                self.finished.emit(bars["dates"], bars["close"], None, bars)
+                return
+
             nbu = NBUExchangeRates(currency_code=self.currency_code)
-            dates, rates = nbu.get_rates(days=self.days)
+            dates, rates = nbu.get_rates_for_period(start_date, end_date)
 
             elapsed = time.time() - self._start_time
-            if elapsed > self.timeout:
+            if self.days <= LONG_PERIOD_DAYS and elapsed > self.timeout:
                 self.error.emit("Перевищено час очікування відповіді сервера (графік)")
                 return
 
@@ -100,8 +160,17 @@ class ChartWorker(QtCore.QThread):
                 self.error.emit("Недостатньо даних для побудови графіка.")
                 return
 
-            prediction = RatePredictor.predict_rate(dates, rates)
-            self.finished.emit(dates, rates, prediction)
+            if self.resolution == "D":
+                with log_timing("ChartWorker predict", currency=self.currency_code, points=len(rates)):
+                    prediction = RatePredictor.predict_interval(dates, rates, horizon=self.forecast_horizon)
+                bars = daily_bars(dates, rates)
+            else:
+                # Готові агрегати зі сховища замість перерахунку денних даних;
+                # денний прогноз не узгоджується з кроком барів, тому не будується
+                prediction = None
+                bars = BarAggregator.instance().get_bars(self.currency_code, self.resolution, dates[0], dates[-1])
+                dates, rates = bars["dates"], bars["close"]
+            self.finished.emit(dates, rates, prediction, bars)
 
         except Exception as e:
             logging.error(f"Помилка в ChartWorker: {e}\n{traceback.format_exc()}")
@@ -118,10 +187,12 @@ class RateWorker(QtCore.QThread):
         self.timeout = timeout
         self._start_time = None
 
+    @profiled("RateWorker.run")
     def run(self) -> None:
         self._start_time = time.time()
         try:
-            rate_data = self.scrapper.get_rate_to_uah(self.currency_code)
+            with log_timing("RateWorker get_rate_to_uah", currency=self.currency_code):
+                rate_data = self.scrapper.get_rate_to_uah(self.currency_code)
 
             elapsed = time.time() - self._start_time
             if elapsed > self.timeout:
@@ -134,3 +205,178 @@ class RateWorker(QtCore.QThread):
         except Exception as e:
             logging.error(f"Помилка в RateWorker: {e}\n{traceback.format_exc()}")
             self.error.emit("Помилка при отриманні курсу.")
+
+
+class HistoryWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(object, object, object)  # дати, курси, дати без відповіді сервера
+    error = QtCore.pyqtSignal(str, object)  # повідомлення, запитані дати
+
+    def __init__(self, currency_code: str, wanted: List[date]) -> None:
+        super().__init__()
+        self.currency_code = currency_code
+        self.wanted = wanted
+
+    def run(self) -> None:
+        try:
+            nbu = NBUExchangeRates(currency_code=self.currency_code)
+            dates, rates = nbu.get_rates_for_dates(self.wanted)
+            self.finished.emit(dates or [], rates or [], nbu.failed_dates)
+
+        except Exception as e:
+            logging.error(f"Помилка в HistoryWorker: {e}\n{traceback.format_exc()}")
+            self.error.emit(f"Помилка при завантаженні історії: {e}", self.wanted)
+
+
+class SnapshotWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(object, dict)  # дата знімка, {код: курс}
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(
+        self,
+        symbols: Optional[List[str]],
+        scrapper: ExchangeRateAPIClient,
+        day: Optional[date] = None
+    ) -> None:
+        """
+        :param symbols: валюти знімка; None — увесь ринок
+        :param day: дата курсів (None — поточні курси)
+        """
+        super().__init__()
+        self.symbols = symbols
+        self.scrapper = scrapper
+        self.day = day
+
+    def run(self) -> None:
+        try:
+            # Один запит на весь список замість окремого на кожну валюту
+            with log_timing("SnapshotWorker get_snapshot", day=self.day) as fields:
+                snapshot = self.scrapper.get_snapshot(self.day)
+                # Дата знімка потрібна таблиці, щоб після півночі чи публікації зсунути «попередній» курс
+                day = snapshot["date"] or self.day or date.today()
+                rates = {code: rate for code, rate in snapshot["rates"].items()
+                         if self.symbols is None or code in self.symbols}
+                RateStore.instance().insert_many((code, day, rate) for code, rate in rates.items())
+                fields["symbols"] = len(rates)
+            self.finished.emit(day, rates)
+
+        except Exception as e:
+            logging.error(f"Помилка в SnapshotWorker: {e}\n{traceback.format_exc()}")
+            self.error.emit("Помилка при оновленні курсів.")
+
+
+class AnalyticsWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(dict)
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, days: int, codes: Optional[List[str]] = None) -> None:
+        super().__init__()
+        self.days = days
+        self.codes = codes
+
+    def run(self) -> None:
+        try:
+            end_date = date.today()
+            start_date = end_date - timedelta(days=self.days)
+            with log_timing("AnalyticsWorker get_analytics", days=self.days):
+                result = get_analytics(start_date, end_date, self.codes)
+            if not result["codes"]:
+                self.error.emit("Недостатньо збережених даних для аналітики.")
+                return
+            self.finished.emit(result)
+
+        except Exception as e:
+            logging.error(f"Помилка в AnalyticsWorker: {e}\n{traceback.format_exc()}")
+            self.error.emit(f"Помилка при розрахунку аналітики: {e}")
+
+
+class ThumbnailWorker(QtCore.QThread):
+    thumbnail_ready = QtCore.pyqtSignal(str, bytes)  # код валюти, PNG
+    finished = QtCore.pyqtSignal()
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, currencies: List[str], days: int, chart_settings: dict) -> None:
+        super().__init__()
+        self.currencies = currencies
+        self.days = days
+        self.chart_settings = chart_settings
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Зупинити після поточної валюти чи мініатюри; невиконані завдання пулу скасовуються.
+        """
+        self._cancelled = True
+
+    def run(self) -> None:
+        try:
+            jobs = []
+            for currency in self.currencies:
+                if self._cancelled:
+                    break
+                jobs += load_jobs([currency], self.days, self.chart_settings, size=(3.2, 2.4), dpi=80)
+            with log_timing("ThumbnailWorker render", charts=len(jobs)):
+                # Рендер у пулі процесів; мініатюри надходять у UI по мірі готовності
+                for currency, png in render_many(jobs if not self._cancelled else []):
+                    if self._cancelled:
+                        break
+                    self.thumbnail_ready.emit(currency, png)
+            self.finished.emit()
+
+        except Exception as e:
+            logging.error(f"Помилка в ThumbnailWorker: {e}\n{traceback.format_exc()}")
+            self.error.emit(f"Помилка при побудові мініатюр: {e}")
+
+
+class MarketWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(dict)  # {"date", "rates", "previous", "sparklines"}
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, scrapper: ExchangeRateAPIClient, sparkline_days: int = 30) -> None:
+        super().__init__()
+        self.scrapper = scrapper
+        self.sparkline_days = sparkline_days
+
+    def run(self) -> None:
+        try:
+            with log_timing("MarketWorker snapshot") as fields:
+                # Один знімок усього ринку замість запиту на кожну валюту
+                snapshot = self.scrapper.get_snapshot()
+                day = snapshot["date"] or date.today()
+                store = RateStore.instance()
+                store.insert_many((code, day, rate) for code, rate in snapshot["rates"].items())
+
+                # Попередній день та спарклайни — з локального сховища, одним запитом
+                start = day - timedelta(days=self.sparkline_days)
+                previous_day = day - timedelta(days=1)
+                history: dict = {}
+                known_previous = set()
+                for code, ordinal, rate in store.get_period(start, previous_day):
+                    history.setdefault(code, []).append((ordinal, rate))
+                    if ordinal == previous_day.toordinal():
+                        known_previous.add(code)
+
+                # Попередній знімок потрібен, якщо хоч одна валюта не має курсу за вчора
+                # (наприклад, сховище заповнене лише графіками окремих валют)
+                missing_previous = [code for code in snapshot["rates"] if code not in known_previous]
+                if missing_previous:
+                    previous_snapshot = self.scrapper.get_snapshot(previous_day)
+                    previous_date = previous_snapshot["date"] or previous_day
+                    store.insert_many((code, previous_date, rate) for code, rate in previous_snapshot["rates"].items())
+                    for code in missing_previous:
+                        if code in previous_snapshot["rates"]:
+                            history.setdefault(code, []).append((previous_date.toordinal(), previous_snapshot["rates"][code]))
+                    fields["previous_fetched"] = len(missing_previous)
+
+                previous = {}
+                sparklines = {}
+                for code, points in history.items():
+                    points.sort()
+                    previous[code] = points[-1][1]
+                    sparklines[code] = [rate for _, rate in points] + [snapshot["rates"].get(code, points[-1][1])]
+                fields["currencies"] = len(snapshot["rates"])
+
+            self.finished.emit({"date": day, "rates": snapshot["rates"], "previous": previous, "sparklines": sparklines})
+
+        except Exception as e:
+            logging.error(f"Помилка в MarketWorker: {e}\n{traceback.format_exc()}")
+            self.error.emit("Помилка при отриманні курсів.")
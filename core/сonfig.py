@@ -1,5 +1,6 @@
 import json
 import os
+import tempfile
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(BASE_DIR, "cfgs", "config.json")
@@ -20,9 +21,21 @@ def load_config() -> dict:
 def save_config(data: dict) -> None:
     """
     Сохраняет конфигурацию в файл JSON с отступами для удобства чтения.
+    Запись атомарна: сначала во временный файл, затем переименование,
+    поэтому при сбое на диске остается либо старая, либо новая версия.
     """
     # Создаем директорию, если ее нет
-    os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
+    config_dir = os.path.dirname(CONFIG_PATH)
+    os.makedirs(config_dir, exist_ok=True)
 
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".json", dir=config_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
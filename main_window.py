@@ -1,32 +1,40 @@
 import sys
 import logging
+import threading
 from typing import Optional, List, Tuple, Dict
 from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QComboBox, QProgressBar, QMessageBox, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QListWidget
+    QApplication, QMainWindow, QComboBox, QProgressBar, QMessageBox, QPushButton, QHBoxLayout, QVBoxLayout, QLabel,
+    QLineEdit, QTableView
 )
 from matplotlib import pyplot as plt
 
 from core.scrap import ExchangeRateAPIClient
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.dates as mdates
-from core.workers import ChartWorker, RateWorker, PredictWorker
+from core.workers import ChartWorker, RateWorker, PredictWorker, MarketWorker
+from core.viewport import HistoryViewport
+from core.rates_model import CODE, SPARKLINE, RatesTableModel, RatesFilterProxyModel, SparklineDelegate
+from core.graphic import draw_rates
+from core.resample import BarAggregator
+from core.archive import RateArchive
 from datetime import date
 
 from core.settings import SettingsService, ThemeSettingsDialog
+from core.logs import setup_logging, stop_logging
+from core import profiling
+from core.profiling import profiled
+from core.scheduler import RefreshScheduler
+from core.alerts import AlertEngine
+from core.alerts_dialog import AlertsDialog
+from core.analytics_dialog import AnalyticsDialog
+from core.thumbnails_dialog import ThumbnailsDialog
+from core.render import shutdown_pool
 import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 icon_path = os.path.join(BASE_DIR, "icons", "ico.png")
 
 
-logging.basicConfig(
-    filename='app.log',
-    filemode='a',
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.DEBUG
-)
-
 scrapper = ExchangeRateAPIClient()
 
 
@@ -40,18 +48,40 @@ class App(object):
         self.pushButton_clear_delete = None
         self.pushButton_chart = None
         self.pushButton_show = None
-        self.listWidget = None
-        self.currencies = None
+        self.tableView = None
+        self.filterEdit = None
+        self.rates_model = RatesTableModel()
+        self.rates_proxy = RatesFilterProxyModel()
+        self.rates_proxy.setSourceModel(self.rates_model)
+        self.market_worker: Optional[MarketWorker] = None
         self.chart_worker: Optional[ChartWorker] = None
         self.rate_worker: Optional[RateWorker] = None
         self.figure: Optional[Figure] = None
         self.canvas: Optional[FigureCanvas] = None
+        self.viewport: Optional[HistoryViewport] = None
+        self.chart_forecast: Optional[dict] = None
         self.rate_cache: Dict[str, str] = {}
-        self.chart_cache: Dict[Tuple[str, int], Tuple[List[date], List[float]]] = {}
+        self.chart_cache: Dict[Tuple[str, int, str], Tuple[List[date], List[float], dict, Optional[dict]]] = {}
+        self.chart_key: Optional[Tuple[str, int, str]] = None  # ключ показаного графіка
+        self.scheduler: Optional[RefreshScheduler] = None
+        self.alert_engine: Optional[AlertEngine] = None
+        self.tray_icon: Optional[QtWidgets.QSystemTrayIcon] = None
 
         self.app = app
-        self.settings = SettingsService()
+        self.settings = SettingsService.instance()
         self.is_dark_theme = self.settings.load_theme()
+        self.app.aboutToQuit.connect(self.settings.flush)
+        self.app.aboutToQuit.connect(shutdown_pool)
+        profiling.set_enabled(profiling.env_enabled() or self.settings.get("profiling", False))
+        # Бари й архів можуть наздоганяти сховище після імпорту (секунди на повну історію),
+        # тож будуються у фоні; воркери, яким вони потрібні раніше, чекають на замках instance()
+        threading.Thread(target=self.warm_up_storage, name="StorageWarmup", daemon=True).start()
+
+    @staticmethod
+    def warm_up_storage() -> None:
+        # Підписка агрегатора на нові курси до перших запитів, щоб бари оновлювались інкрементно
+        BarAggregator.instance()
+        RateArchive.instance()
 
     def setupUi(self, MainWindow: QMainWindow) -> None:
         MainWindow.setObjectName("MainWindow")
@@ -80,18 +110,28 @@ class App(object):
         except Exception as e:
             logging.error(f"Ошибка загрузки стилей: {e}")
 
-        self.currencies = scrapper.get_symbols()["symbols"]
-
         # Левая часть
         left_layout = QVBoxLayout()
         left_layout.setContentsMargins(10, 10, 10, 10)
         left_layout.setSpacing(15)
 
-        self.listWidget = QListWidget()
-        self.listWidget.setFixedSize(220, 350)  # чуть меньше высота
-        for cur in self.currencies.keys():
-            self.listWidget.addItem(cur)
-        self.listWidget.setCurrentRow(0)
+        self.filterEdit = QLineEdit()
+        self.filterEdit.setFixedWidth(360)
+        self.filterEdit.setPlaceholderText("Пошук валюти...")
+        self.filterEdit.textChanged.connect(self.rates_proxy.setFilterFixedString)
+
+        # Весь ринок в одній таблиці; рядки заповнюються одним знімком курсів
+        self.tableView = QTableView()
+        self.tableView.setFixedSize(360, 320)
+        self.tableView.setModel(self.rates_proxy)
+        self.tableView.setSortingEnabled(True)
+        self.tableView.sortByColumn(CODE, QtCore.Qt.AscendingOrder)
+        self.tableView.setSelectionBehavior(QTableView.SelectRows)
+        self.tableView.setSelectionMode(QTableView.SingleSelection)
+        self.tableView.verticalHeader().setVisible(False)
+        self.tableView.verticalHeader().setDefaultSectionSize(24)
+        self.tableView.horizontalHeader().setStretchLastSection(True)
+        self.tableView.setItemDelegateForColumn(SPARKLINE, SparklineDelegate(self.tableView))
 
         self.pushButton_show = QPushButton("Показати курс")
         self.pushButton_show.setFixedSize(220, 40)
@@ -119,6 +159,16 @@ class App(object):
         self.comboBox_days.addItem("30 днів", 30)
         self.comboBox_days.addItem("90 днів", 90)
         self.comboBox_days.addItem("1 рік", 365)
+        self.comboBox_days.addItem("3 роки", 3 * 365)
+        self.comboBox_days.addItem("10 років", 10 * 365)
+
+        self.comboBox_resolution = QComboBox()
+        self.comboBox_resolution.setFixedSize(220, 30)
+        self.comboBox_resolution.setToolTip("Крок графiку: денні курси або агреговані бари.")
+        self.comboBox_resolution.addItem("По днях", "D")
+        self.comboBox_resolution.addItem("По тижнях", "W")
+        self.comboBox_resolution.addItem("По місяцях", "M")
+        self.comboBox_resolution.addItem("По кварталах", "Q")
 
         self.label = QLabel("Оберіть валюту та натисніть «Показати курс»")
         self.label.setAlignment(QtCore.Qt.AlignCenter)
@@ -131,12 +181,14 @@ class App(object):
         self.progressBar.setVisible(False)
 
         # Добавляем в левую колонку
-        left_layout.addWidget(self.listWidget)
+        left_layout.addWidget(self.filterEdit)
+        left_layout.addWidget(self.tableView)
         left_layout.addWidget(self.pushButton_show)
         left_layout.addWidget(self.pushButton_chart)
         left_layout.addWidget(self.pushButton_clear_delete)
         left_layout.addWidget(self.predict_btn)
         left_layout.addWidget(self.comboBox_days)
+        left_layout.addWidget(self.comboBox_resolution)
         left_layout.addWidget(self.progressBar)
         left_layout.addWidget(self.label)
 
@@ -157,6 +209,27 @@ class App(object):
 
         self.pushButton_settings.clicked.connect(self.open_settings)
 
+        self.pushButton_alerts = QPushButton("🔔")
+        self.pushButton_alerts.setFixedSize(30, 30)
+        self.pushButton_alerts.setToolTip("Сповіщення")
+        self.pushButton_alerts.setFlat(True)
+        self.pushButton_alerts.clicked.connect(self.open_alerts)
+
+        self.pushButton_analytics = QPushButton("📊")
+        self.pushButton_analytics.setFixedSize(30, 30)
+        self.pushButton_analytics.setToolTip("Аналітика: кореляції та волатильність")
+        self.pushButton_analytics.setFlat(True)
+        self.pushButton_analytics.clicked.connect(self.open_analytics)
+
+        self.pushButton_thumbnails = QPushButton("🖼")
+        self.pushButton_thumbnails.setFixedSize(30, 30)
+        self.pushButton_thumbnails.setToolTip("Мініатюри графіків валют зі списку спостереження")
+        self.pushButton_thumbnails.setFlat(True)
+        self.pushButton_thumbnails.clicked.connect(self.open_thumbnails)
+
+        top_bar.addWidget(self.pushButton_thumbnails)
+        top_bar.addWidget(self.pushButton_analytics)
+        top_bar.addWidget(self.pushButton_alerts)
         top_bar.addWidget(self.pushButton_settings)
 
         right_layout.addLayout(top_bar)
@@ -181,7 +254,43 @@ class App(object):
 
         self.right_layout = self.chart_container
 
+        if QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QtWidgets.QSystemTrayIcon(QtGui.QIcon(icon_path), MainWindow)
+            self.tray_icon.show()
+
+        self.scheduler = RefreshScheduler(scrapper, settings=self.settings)
+        self.scheduler.snapshot_ready.connect(self.on_snapshot_ready)
+        self.scheduler.rates_changed.connect(self.on_rates_changed)
+        self.scheduler.published.connect(self.on_rates_published)
+        self.scheduler.error.connect(self.on_scheduler_error)
+        self.reload_alerts()
+        self.settings.changed.connect(self.on_setting_changed)
+        self.scheduler.start()
+        self.start_market_worker()
+
+    def current_currency(self) -> Optional[str]:
+        index = self.tableView.currentIndex()
+        if not index.isValid():
+            return None
+        return self.rates_model.code_at(self.rates_proxy.mapToSource(index).row())
+
+    def start_market_worker(self) -> None:
+        if self.market_worker and self.market_worker.isRunning():
+            return
+        self.market_worker = MarketWorker(scrapper)
+        self.market_worker.finished.connect(self.on_market_ready)
+        self.market_worker.error.connect(self.label.setText)
+        self.market_worker.start()
+
+    def on_market_ready(self, market: dict) -> None:
+        self.rates_model.update_snapshot(market["rates"], market["previous"], market["sparklines"], day=market["date"])
+        # Той самий знімок заміняє перший тік планувальника — без повторного запиту
+        self.scheduler.apply_snapshot(market["date"], market["rates"])
+        if not self.tableView.currentIndex().isValid() and self.rates_proxy.rowCount():
+            self.tableView.selectRow(0)
+
     def clear_and_delete_chart(self) -> None:
+        self.close_viewport()
         if self.canvas:
             self.right_layout.removeWidget(self.canvas)
             self.canvas.setParent(None)
@@ -207,11 +316,10 @@ class App(object):
         if self.rate_worker and self.rate_worker.isRunning():
             self.show_error("Запит курсу вже виконується. Будь ласка, зачекайте.")
             return
-        item = self.listWidget.currentItem()
-        if not item:
+        selected_currency = self.current_currency()
+        if not selected_currency:
             self.show_error("Будь ласка, оберіть валюту зі списку.")
             return
-        selected_currency = item.text()
 
         if selected_currency in self.rate_cache:
             self.label.setText(self.rate_cache[selected_currency])
@@ -232,11 +340,54 @@ class App(object):
 
     def on_rate_ready(self, text: str) -> None:
         self.label.setText(text)
-        item = self.listWidget.currentItem()
-        if item:
-            currency = item.text()
+        currency = self.current_currency()
+        if currency:
             self.rate_cache[currency] = text
 
+    def on_snapshot_ready(self, day: date, rates: dict) -> None:
+        # Свіжий знімок робить застарілими всі збережені тексти курсів
+        self.rate_cache = {code: self.format_rate(code, rate) for code, rate in rates.items()}
+        self.rates_model.update_snapshot(rates, day=day)
+        if self.alert_engine:
+            for match in self.alert_engine.evaluate(rates):
+                self.notify(match["message"])
+
+    def on_rates_published(self, day: date, rates: dict) -> None:
+        self.notify(f"NBU опублікував курси на {day:%d.%m.%Y} ({len(rates)} валют)")
+
+    def on_scheduler_error(self, msg: str) -> None:
+        # Фонове оновлення не відкриває діалогів: лише напис, деталі — в журналі воркера
+        self.label.setText(msg)
+
+    def on_setting_changed(self, key: str, value) -> None:
+        if key == "alerts":
+            self.reload_alerts()
+        elif key == "profiling":
+            profiling.set_enabled(profiling.env_enabled() or value)
+
+    def reload_alerts(self) -> None:
+        self.alert_engine = AlertEngine(self.settings.get("alerts", []))
+
+    def notify(self, message: str) -> None:
+        # Неблокуюче повідомлення: у системному треї, інакше — у написі
+        logging.info(f"Сповіщення: {message}")
+        if self.tray_icon:
+            self.tray_icon.showMessage("Курси Валют", message, QtWidgets.QSystemTrayIcon.Information, 5000)
+        else:
+            self.label.setText(message)
+
+    def on_rates_changed(self, rates: dict) -> None:
+        currency = self.current_currency()
+        if currency not in rates:
+            return
+        # Оновлюємо напис, лише якщо він зараз показує курс цієї валюти
+        if self.label.text().startswith(f"Курс {currency} "):
+            self.label.setText(self.format_rate(currency, rates[currency]))
+
+    @staticmethod
+    def format_rate(currency: str, rate: float) -> str:
+        return f"Курс {currency} → UAH: {rate:.2f}"
+
     def on_rate_error(self, msg: str) -> None:
         self.show_error("Помилка завантаження курсу: " + msg)
 
@@ -245,21 +396,22 @@ class App(object):
         if self.chart_worker and self.chart_worker.isRunning():
             self.show_error("Запит графіка вже виконується. Будь ласка, зачекайте.")
             return
+        self.close_viewport()
         if self.canvas:
             self.right_layout.removeWidget(self.canvas)
             self.canvas.setParent(None)
             self.canvas.deleteLater()
             self.canvas = None
             self.figure = None
-        item = self.listWidget.currentItem()
-        if not item:
+        currency = self.current_currency()
+        if not currency:
             self.show_error("Будь ласка, оберіть валюту зі списку.")
             return
-        currency = item.text()
         days = self.comboBox_days.currentData()
-        key = (currency, days)
+        resolution = self.comboBox_resolution.currentData()
+        key = (currency, days, resolution)
         if key in self.chart_cache:
-            self.show_chart(*self.chart_cache[key])
+            self.show_chart(key, *self.chart_cache[key])
             return
 
         self.label.setText("Завантаження графіка...")
@@ -269,28 +421,45 @@ class App(object):
             self.chart_worker.quit()
             self.chart_worker.wait()
 
-        self.chart_worker = ChartWorker(currency, days)
+        self.chart_worker = ChartWorker(currency, days, resolution=resolution)
         self.chart_worker.finished.connect(self.on_chart_ready)
         self.chart_worker.error.connect(self.on_chart_error)
         self.chart_worker.finished.connect(lambda: self.progressBar.setVisible(False))
         self.chart_worker.start()
 
-    def on_chart_ready(self, dates: List[date], rates: List[float]) -> None:
+    def on_chart_ready(self, dates: List[date], rates: List[float], prediction: Optional[dict], bars: dict) -> None:
 
-        key = (self.listWidget.currentItem().text(), self.comboBox_days.currentData())
-        self.chart_cache[key] = (dates, rates)
-        self.show_chart(dates, rates)
+        key = (
+            self.chart_worker.currency_code,
+            self.chart_worker.days,
+            self.chart_worker.resolution
+        )
+        self.chart_cache[key] = (dates, rates, bars, prediction)
+        self.show_chart(key, dates, rates, bars, prediction)
 
     def on_chart_error(self, msg: str) -> None:
         self.show_error("Помилка завантаження графіка: " + msg)
 
-    def show_chart(self, dates: list, rates: list) -> None:
+    @profiled("App.show_chart")
+    def show_chart(
+        self,
+        key: Tuple[str, int, str],
+        dates: list,
+        rates: list,
+        bars: Optional[dict] = None,
+        forecast: Optional[dict] = None
+    ) -> None:
+        """
+        :param key: (валюта, дні, роздільність) графіка — з воркера або кешу, а не з комбобоксів,
+                    які користувач міг змінити, поки графік завантажувався
+        """
+        self.close_viewport()
         if self.canvas:
             self.right_layout.removeWidget(self.canvas)
             self.canvas.setParent(None)
             self.canvas.deleteLater()
-        chart_settings = self.settings.load_chart_settings()
-        line_color = chart_settings.get("line_color", "#2d78d8")
+        # Налаштування беремо з пам'яті один раз на рендер
+        chart_settings = self.settings.chart_settings
         self.figure = plt.Figure(figsize=(7, 5))
         self.canvas = FigureCanvas(self.figure)
         self.right_layout.addWidget(self.canvas)
@@ -303,55 +472,51 @@ class App(object):
             self.show_error("Немає даних для побудови графіка.")
             return
 
-        chart_settings = self.settings.load_chart_settings()
-        chart_type = chart_settings.get("chart_type", "Лінійний")
-        show_grid = chart_settings.get("show_grid", True)
-        show_sma = chart_settings.get("show_sma", False)
-
-        has_label = False
-
-        if chart_type == "Лінійний":
-            ax.plot(dates, rates, label="Курс", color=line_color)
-            has_label = True
-        elif chart_type == "Баровий":
-            ax.bar(dates, rates, label="Баровий", color=line_color)
-            has_label = True
-        elif chart_type == "Точечний":
-            ax.scatter(dates, rates, label="Точечний", color=line_color)
-            has_label = True
-        elif chart_type == "Діаграмма розбросу":
-            ax.scatter(dates, rates, label='Курс (точки)',color = line_color)
-            has_label = True
-
-
-        if show_sma and len(rates) >= 5:
-            window = 5
-            sma = [sum(rates[i - window:i]) / window for i in range(window, len(rates) + 1)]
-            ax.plot(dates[window - 1:], sma, label="SMA", linestyle="--", color="orange")
-            has_label = True
-
-        if has_label:
-            ax.legend()
-
-        ax.grid(show_grid)
-        ax.set_title("Динаміка курсу")
-        ax.set_xlabel("Дата")
-        ax.set_ylabel("Курс")
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%d-%m-%Y"))
-        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-        self.figure.autofmt_xdate()
+        draw_rates(ax, dates, rates, chart_settings, bars, forecast)
+        self.chart_key = key
         self.label.setText("Графiк побудовано.")
         self.canvas.draw()
+
+        # Денний ряд можна панорамувати в минуле: історія довантажується за видимим діапазоном
+        currency, _days, resolution = key
+        if resolution == "D":
+            self.chart_forecast = forecast
+            self.viewport = HistoryViewport(self.canvas, ax, currency, dates, rates)
+            self.viewport.series_changed.connect(self.on_history_loaded)
+            self.viewport.error.connect(self.label.setText)
+
+    def close_viewport(self) -> None:
+        if self.viewport:
+            self.viewport.close()
+            self.viewport = None
+
+    def redraw_viewport(self, chart_settings: dict) -> None:
+        """
+        Перемалювати довантажений ряд, зберігши поточний видимий діапазон.
+        """
+        ax = self.figure.axes[0]
+        xlim = ax.get_xlim()
+        dates, rates = self.viewport.series_lists()
+        ax.clear()
+        # Свічки будуються з об'єднаного ряду, а не з барів початкового періоду
+        draw_rates(ax, dates, rates, chart_settings, None, self.chart_forecast)
+        ax.set_xlim(xlim)
+        self.viewport.fit_y()
+        self.viewport.attach(ax)
+        self.canvas.draw_idle()
+
+    def on_history_loaded(self) -> None:
+        if self.viewport and self.figure:
+            self.redraw_viewport(self.settings.chart_settings)
     def on_predict_button_clicked(self):
 
-        item = self.listWidget.currentItem()
+        selected_currency = self.current_currency()
 
-        if not item:
+        if not selected_currency:
             self.show_error("Будь ласка, оберіть валюту зі списку.")
 
             return
         self.progressBar.setVisible(True)
-        selected_currency = item.text()
         self.predict_worker = PredictWorker(selected_currency, days=30)
         self.predict_worker.finished.connect(self.on_predict_finished)
         self.predict_worker.error.connect(self.on_predict_error)
@@ -365,8 +530,7 @@ class App(object):
         self.progressBar.setVisible(False)
         self.show_error(error_text)
     def open_settings(self)-> None:
-        settings_service = SettingsService()
-        dlg = ThemeSettingsDialog(settings_service=settings_service)
+        dlg = ThemeSettingsDialog(settings_service=self.settings)
         if dlg.exec_and_save():
             print("Налаштування змінені.")
             if dlg.is_dark_theme:
@@ -374,12 +538,23 @@ class App(object):
             else:
                 self.apply_light_theme()
             # Не вызывать сразу обновление графика
-            chart_settings = dlg.selected_chart_settings()
-            self.settings.save_chart_settings(chart_settings)
             # self.apply_chart_settings(chart_settings)  <-- убрать или закомментировать
         else:
             print("Налаштування не змінені.")
 
+    def open_thumbnails(self) -> None:
+        dlg = ThumbnailsDialog(self.settings.thumbnail_currencies, self.comboBox_days.currentData(), self.settings.chart_settings)
+        dlg.exec()
+
+    def open_analytics(self) -> None:
+        dlg = AnalyticsDialog()
+        dlg.exec()
+
+    def open_alerts(self) -> None:
+        dlg = AlertsDialog(settings_service=self.settings)
+        if dlg.exec_and_save() and self.scheduler.last_rates:
+            self.scheduler.tick()
+
     def apply_dark_theme(self) -> None:
         try:
             with open(os.path.join(BASE_DIR, "styles", "dark.css"), "r", encoding="utf-8") as f:
@@ -405,66 +580,27 @@ class App(object):
     def apply_chart_settings(self, chart_settings: dict) -> None:
         if not self.figure or not self.canvas:
             return  # график еще не построен
-
-        # Получаем параметры
-        chart_type = chart_settings.get("chart_type", "Лінійний")
-        show_grid = chart_settings.get("show_grid", True)
-        show_sma = chart_settings.get("show_sma", False)
-
-        # Получаем текущие данные графика из кеша (если есть)
-        current_item = self.listWidget.currentItem()
-        if not current_item:
+        if self.viewport:
+            self.redraw_viewport(chart_settings)
             return
-        currency = current_item.text()
-        days = self.comboBox_days.currentData()
-        key = (currency, days)
-        if key not in self.chart_cache:
+
+        # Получаем данные показанного графика из кеша (если есть)
+        if self.chart_key not in self.chart_cache:
             return
-        dates, rates = self.chart_cache[key]
+        dates, rates, bars, forecast = self.chart_cache[self.chart_key]
 
         ax = self.figure.axes[0]
         ax.clear()
-        chart_settings = self.settings.load_chart_settings()
-        line_color = chart_settings.get("line_color", "#2d78d8")
-        # Отрисовка графика по типу
-        if chart_type == "Лінійний":
-            ax.plot(dates, rates, label="Курс", color=line_color)
-            has_label = True
-        elif chart_type == "Баровий":
-            ax.bar(dates, rates, label="Баровий", color=line_color)
-            has_label = True
-        elif chart_type == "Точечний":
-            ax.scatter(dates, rates, label="Точечний", color=line_color)
-            has_label = True
-        elif chart_type == "Діаграмма розбросу":
-            ax.scatter(dates, rates, label='Курс (точки)', color=line_color)
-            has_label = True
-
-        if show_grid:
-            ax.grid(True)
-        else:
-            ax.grid(False)
-
-        if show_sma:
-            window = 5
-            if len(rates) >= window:
-                sma = [sum(rates[i - window:i]) / window for i in range(window, len(rates) + 1)]
-                ax.plot(dates[window - 1:], sma, label="SMA", linestyle="--", color="orange")
-
-        ax.set_title("Динаміка курсу")
-        ax.set_xlabel("Дата")
-        ax.set_ylabel("Курс")
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%d-%m-%Y"))
-        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-        self.figure.autofmt_xdate()
-
-        ax.legend()
+        draw_rates(ax, dates, rates, chart_settings, bars, forecast)
         self.canvas.draw()
 
     
 
 if __name__ == "__main__":
+    # Логування налаштовується лише в головному процесі, не в процесах рендеру
+    setup_logging()
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(stop_logging)
     main_window = QMainWindow()
     application = App(app)
     application.setupUi(main_window)
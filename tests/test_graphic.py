@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+import requests
+
+from core.graphic import NBUExchangeRates
+from core.ratelimit import CircuitOpenError
+from core.storage import RateStore
+
+
+class ScriptedSession:
+    """
+    Замінник RateLimitedSession: відповідь NBU (або виняток) на кожну дату.
+    """
+
+    def __init__(self, outcomes: dict) -> None:
+        self.outcomes = outcomes
+
+    def get_json(self, url: str):
+        day = date(int(url[-13:-9]), int(url[-9:-7]), int(url[-7:-5]))
+        outcome = self.outcomes[day]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_failed_dates_exclude_answered_dates_without_rate(tmp_path):
+    start = date(1998, 12, 30)
+    wanted = [start + timedelta(days=i) for i in range(4)]
+    session = ScriptedSession({
+        wanted[0]: [],  # валюти ще не існувало
+        wanted[1]: CircuitOpenError("circuit open"),
+        wanted[2]: requests.ConnectionError("timeout"),
+        wanted[3]: [{"cc": "EUR", "rate": 4.1}],
+    })
+    nbu = NBUExchangeRates("EUR", session=session, store=RateStore(str(tmp_path / "rates.sqlite3")))
+
+    dates, rates = nbu.get_rates_for_dates(wanted)
+
+    assert (dates, rates) == ([wanted[3]], [4.1])
+    assert nbu.failed_dates == [wanted[1], wanted[2]]
@@ -0,0 +1,63 @@
+import logging
+
+from core import logs
+from core.logs import RepeatFilter
+
+
+def make_record(msg: str, lineno: int = 10, level: int = logging.WARNING) -> logging.LogRecord:
+    return logging.LogRecord("root", level, "core/graphic.py", lineno, msg, None, None)
+
+
+def test_warnings_from_one_call_site_are_suppressed():
+    repeat_filter = RepeatFilter([].append, window=60.0)
+
+    assert repeat_filter.filter(make_record("Отсутствует курс на 2024-01-01"))
+    assert not repeat_filter.filter(make_record("Отсутствует курс на 2024-01-02"))
+    assert repeat_filter.filter(make_record("Отсутствует курс на 2024-01-02", lineno=20))
+
+
+def test_errors_are_never_suppressed():
+    repeat_filter = RepeatFilter([].append, window=60.0)
+
+    assert repeat_filter.filter(make_record("HTTP ошибка: timeout", level=logging.ERROR))
+    assert repeat_filter.filter(make_record("HTTP ошибка: 503", level=logging.ERROR))
+
+
+def test_summary_is_emitted_when_window_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logs.time, "monotonic", lambda: now[0])
+    emitted = []
+    repeat_filter = RepeatFilter(emitted.append, window=60.0)
+
+    repeat_filter.filter(make_record("Отсутствует курс на 2024-01-01"))
+    repeat_filter.filter(make_record("Отсутствует курс на 2024-01-02"))
+    repeat_filter.filter(make_record("Отсутствует курс на 2024-01-03"))
+    assert emitted == []
+
+    now[0] += 61
+    assert repeat_filter.filter(make_record("інше повідомлення", level=logging.INFO))
+    assert [record.getMessage() for record in emitted] == [
+        "Отсутствует курс на 2024-01-03 (повторів пропущено: 2)"
+    ]
+
+
+def test_flush_emits_pending_summaries():
+    emitted = []
+    repeat_filter = RepeatFilter(emitted.append, window=60.0)
+    repeat_filter.filter(make_record("Отсутствует курс"))
+    repeat_filter.filter(make_record("Отсутствует курс"))
+
+    repeat_filter.flush()
+
+    assert [record.getMessage() for record in emitted] == ["Отсутствует курс (повторів пропущено: 1)"]
+
+
+def test_seen_call_sites_are_capped():
+    repeat_filter = RepeatFilter([].append, window=60.0, max_keys=3)
+
+    for lineno in range(10):
+        repeat_filter.filter(make_record("повідомлення", lineno))
+
+    assert len(repeat_filter._seen) == 3
+    # Витіснене місце виклику знову пропускається
+    assert repeat_filter.filter(make_record("повідомлення", 0))
@@ -0,0 +1,82 @@
+import pytest
+import requests
+
+from core.ratelimit import CircuitBreaker, CircuitOpenError, RateLimitedSession, TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return []
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class ScriptedHTTP:
+    """
+    Замінник requests.Session: повертає відповіді (або піднімає винятки) по черзі.
+    """
+
+    def __init__(self, *outcomes) -> None:
+        self.outcomes = list(outcomes)
+
+    def get(self, url, timeout=None):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+
+def make_session(*outcomes) -> RateLimitedSession:
+    return RateLimitedSession(
+        bucket=TokenBucket(rate=1e6, capacity=1e6, max_rate=1e6),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.0),
+        max_retries=0,
+        http=ScriptedHTTP(*outcomes)
+    )
+
+
+def open_breaker(session: RateLimitedSession) -> None:
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            session.get("http://nbu/503")
+    assert session.breaker.is_open
+
+
+def test_probe_with_client_error_closes_breaker():
+    session = make_session(503, 503, 404, 200)
+    open_breaker(session)
+
+    with pytest.raises(requests.HTTPError):
+        session.get("http://nbu/404")
+
+    assert not session.breaker.is_open
+    assert session.get("http://nbu/ok").status_code == 200
+
+
+@pytest.mark.parametrize("probe", [429, ValueError("broken body")])
+def test_failed_probe_allows_next_probe(probe):
+    session = make_session(503, 503, probe, 200)
+    open_breaker(session)
+
+    with pytest.raises((requests.HTTPError, ValueError)):
+        session.get("http://nbu/probe")
+
+    # Пробний запит завершено: після reset_timeout запобіжник пропускає наступний
+    assert session.breaker.is_open
+    assert session.get("http://nbu/ok").status_code == 200
+    assert not session.breaker.is_open
+
+
+def test_open_breaker_rejects_while_probe_in_flight():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        RateLimitedSession(breaker=breaker, max_retries=0, http=ScriptedHTTP()).get("http://nbu/x")
@@ -0,0 +1,28 @@
+from datetime import date
+
+from core.rates_model import RatesTableModel
+
+
+def test_new_day_snapshot_advances_previous_and_sparklines():
+    model = RatesTableModel()
+    model.update_snapshot({"USD": 41.0}, {"USD": 40.0}, {"USD": [40.0, 41.0]}, day=date(2024, 1, 1))
+
+    model.update_snapshot({"USD": 41.5}, day=date(2024, 1, 1))
+    assert model.previous == {"USD": 40.0}
+    assert model.sparklines == {"USD": [40.0, 41.5]}
+
+    model.update_snapshot({"USD": 42.0}, day=date(2024, 1, 2))
+    assert model.previous == {"USD": 41.5}
+    assert model.sparklines == {"USD": [40.0, 41.5, 42.0]}
+    assert round(model.change("USD"), 4) == round((42.0 - 41.5) / 41.5 * 100, 4)
+
+
+def test_late_snapshot_keeps_history():
+    model = RatesTableModel()
+    model.update_snapshot({"USD": 42.0}, {"USD": 41.0}, {"USD": [41.0, 42.0]}, day=date(2024, 1, 2))
+
+    model.update_snapshot({"USD": 41.0}, day=date(2024, 1, 1))
+
+    assert model.previous == {"USD": 41.0}
+    assert model.sparklines == {"USD": [41.0, 42.0]}
+    assert model.day == date(2024, 1, 2)
@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+import pytest
+
+from core.resample import BarAggregator
+from core.storage import RateStore
+
+
+def daily_rows(start: date, days: int, base: float):
+    return [("USD", start + timedelta(days=i), base + i) for i in range(days)]
+
+
+def test_bars_rebuilt_after_insert_without_aggregator(tmp_path):
+    path = str(tmp_path / "rates.sqlite3")
+    store = RateStore(path)
+    BarAggregator(store)
+    store.insert_many(daily_rows(date(2024, 1, 1), 10, 40.0))
+
+    # Імпорт з іншого процесу: окреме сховище без підписаного агрегатора
+    RateStore(path).insert_many(daily_rows(date(2024, 1, 11), 60, 50.0))
+
+    bars = BarAggregator(RateStore(path)).get_bars("USD", "M", date(2024, 1, 1), date(2024, 3, 10))
+    assert bars["dates"] == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert bars["close"] == [70.0, 99.0, 109.0]
+
+
+def test_bars_not_rebuilt_when_up_to_date(tmp_path, monkeypatch):
+    path = str(tmp_path / "rates.sqlite3")
+    store = RateStore(path)
+    BarAggregator(store)
+    store.insert_many(daily_rows(date(2024, 1, 1), 10, 40.0))
+
+    monkeypatch.setattr(BarAggregator, "rebuild", lambda self: pytest.fail("зайва перебудова"))
+    BarAggregator(RateStore(path))